@@ -1,28 +1,55 @@
 """OpenTelemetry instrumentation for Claude agents."""
 
-from importlib.metadata import version
+import importlib
+from pathlib import Path
+
+
+def _load_env_file() -> None:
+    """Load .env from the working directory, if there is one."""
+    env_file = Path.cwd() / ".env"
+    if env_file.is_file():
+        from dotenv import load_dotenv  # noqa: PLC0415
+
+        load_dotenv(env_file)
 
-from dotenv import load_dotenv
 
 # Load .env file FIRST - before anything else imports and configures
-load_dotenv()
+_load_env_file()
+
+# Public API is resolved lazily so importing the package (e.g. for `claudia
+# --version`) doesn't pull in the Claude SDK and OpenTelemetry SDK.
+_LAZY = {
+    # Async API (primary)
+    "run_agent_with_telemetry": (".runner", "run_agent_with_telemetry"),
+    "run_agent_interactive": (".runner", "run_agent_interactive"),
+    # Sync API (convenience wrappers)
+    "run_agent_with_telemetry_sync": (".sync", "run_agent_with_telemetry_sync"),
+    "run_agent_interactive_sync": (".sync", "run_agent_interactive_sync"),
+    # Configuration utilities
+    "configure_telemetry": (".telemetry", "configure_telemetry"),
+}
+
+
+def __getattr__(name: str):
+    """Import public API members on first access and cache them."""
+    if name == "__version__":
+        from importlib.metadata import version  # noqa: PLC0415
 
-# Configure logger early (import triggers configuration)
-from .helpers import logger  # noqa: F401, E402
+        value = version("claude_telemetry")
+    elif name in _LAZY:
+        module_name, attr = _LAZY[name]
+        value = getattr(importlib.import_module(module_name, __package__), attr)
+    else:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
 
-# Async API (primary)
-from .runner import run_agent_interactive, run_agent_with_telemetry  # noqa: E402
+    globals()[name] = value
+    return value
 
-# Sync API (convenience wrappers)
-from .sync import (  # noqa: E402
-    run_agent_interactive_sync,
-    run_agent_with_telemetry_sync,
-)
 
-# Configuration utilities
-from .telemetry import configure_telemetry  # noqa: E402
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY, "__version__"})
 
-__version__ = version("claude_telemetry")
 
 __all__ = [
     "__version__",
@@ -1,66 +1,176 @@
 """Command-line interface for Claude Telemetry."""
 
+from functools import lru_cache
 import os
 from pathlib import Path
+import re
+import sys
 
-import typer
-from dotenv import load_dotenv
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from typing import Annotated
 
-from claude_telemetry import __version__
-from claude_telemetry.helpers.logger import configure_logger
-from claude_telemetry.sync import (
-    run_agent_interactive_sync,
-    run_agent_with_telemetry_sync,
-)
+_HELP_TEMPLATE = """\
+Usage: claudia [OPTIONS] [ARGS]...
 
-console = Console()
+{b}🤖 Claude agent with OpenTelemetry instrumentation{r}
 
-# Load environment variables from .env file
-load_dotenv()
+Claudia is a thin wrapper around Claude CLI that adds telemetry.
+All Claude CLI flags are supported - just pass them through.
 
-# Create Typer app with settings to allow unknown options
-app = typer.Typer(
-    context_settings={"ignore_unknown_options": True, "allow_extra_args": True},
-    add_completion=False,
-    rich_markup_mode="rich",
-    pretty_exceptions_enable=True,
-)
+{b}Options:{r}
+
+  --logfire-token TEXT  Logfire API token (or set LOGFIRE_TOKEN env var)
+  --otel-endpoint TEXT  OTEL endpoint URL
+  --otel-headers TEXT   OTEL headers (format: key1=value1,key2=value2)
+  --claudia-debug       Enable claudia debug output
+  -v, --version         Show version and exit
+  --config              Show configuration and exit
+  -h, --help            Show this message and exit
+
+{b}Examples:{r}
+
+  # Single prompt (recommended: use = for flags)
+  claudia --permission-mode=bypassPermissions "fix this"
+
+  # With specific model and Logfire telemetry
+  claudia --model=opus --logfire-token YOUR_TOKEN "review my code"
+
+  # Interactive mode
+  claudia
+
+  # Multiple flags
+  claudia --model=opus --debug=api "analyze my code"
+
+{b}Note:{r} For flags that take values, the --flag=value format
+is recommended to avoid ambiguity with the prompt argument.
+"""
+
+# Help is plain text so --help never touches Rich; terminals get bold headings
+# via raw ANSI escapes
+HELP_TEXT = _HELP_TEMPLATE.format(b="", r="")
+_HELP_TEXT_ANSI = _HELP_TEMPLATE.format(b="\x1b[1m", r="\x1b[0m")
+
+# Claudia's own options that take a value; everything else passes through
+_VALUE_OPTIONS = {
+    "--logfire-token": "logfire_token",
+    "--otel-endpoint": "otel_endpoint",
+    "--otel-headers": "otel_headers",
+}
+
+# Claudia's own boolean options
+_FLAG_OPTIONS = {
+    "--help": "help",
+    "-h": "help",
+    "--version": "version",
+    "-v": "version",
+    "--config": "config",
+    "--claudia-debug": "claudia_debug",
+}
+
+# Options that exit immediately, so nothing else on the command line matters
+_EAGER_OPTIONS = frozenset({"--help", "-h", "--version", "-v", "--config"})
+
+# Splits a Claude CLI flag into its name (leading dashes stripped) and the value
+# after the first "=", if any. Matches any string.
+_FLAG_RE = re.compile(r"-*([^=]*)(?:=(.*))?", re.DOTALL)
+
+
+@lru_cache(maxsize=1)
+def _get_console():
+    """
+    Create the Rich console on first use.
+
+    Rich is only imported when we actually render something, so fast paths
+    like --version never pay for it.
+    """
+    from rich.console import Console  # noqa: PLC0415
+
+    return Console()
+
+
+@lru_cache(maxsize=1)
+def _telemetry_backend() -> str:
+    """Detect which telemetry backend is configured via the environment."""
+    if os.environ.get("LOGFIRE_TOKEN"):
+        return "logfire"
+    if os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return "otel"
+    return "none"
+
+
+_BACKEND_LABELS = {
+    "logfire": "🔥 Logfire",
+    "otel": "📊 OpenTelemetry",
+    "none": "⚠️  None (debug mode)",
+}
 
 
 def handle_agent_error(e: Exception) -> None:
     """Handle agent execution errors consistently."""
+    console = _get_console()
     if isinstance(e, KeyboardInterrupt):
         console.print("\n[yellow]Interrupted by user[/yellow]")
-        raise typer.Exit(0) from e
+        raise SystemExit(0) from e
     if isinstance(e, RuntimeError):
         # Telemetry configuration errors - show them prominently
         console.print(f"\n[bold red]{e}[/bold red]\n")
-        raise typer.Exit(1) from e
+        raise SystemExit(1) from e
     # For other exceptions, show error and re-raise with context
     console.print(f"[red]Error: {e}[/red]")
-    raise typer.Exit(1) from e
+    raise SystemExit(1) from e
 
 
-def version_callback(value: bool) -> None:
-    """Show version and exit."""
-    if value:
-        console.print(f"claudia version {__version__}")
-        raise typer.Exit
+def show_help() -> None:
+    """Show usage help."""
+    color = sys.stdout.isatty() and "NO_COLOR" not in os.environ
+    sys.stdout.write(_HELP_TEXT_ANSI if color else HELP_TEXT)
 
 
-def config_callback(value: bool) -> None:
-    """Show config and exit."""
-    if value:
-        show_config()
-        raise typer.Exit
+def parse_args(argv: list[str]) -> tuple[dict[str, str | bool], list[str]]:
+    """
+    Split claudia's own options from pass-through Claude CLI arguments.
+
+    Claudia options may appear anywhere on the command line. Value options
+    accept both `--option value` and `--option=value`.
+
+    Args:
+        argv: Raw command-line arguments (without the program name)
+
+    Returns:
+        Tuple of (claudia options dict, remaining args for Claude CLI)
+    """
+    # Help/version/config short-circuit before walking the arguments
+    eager = _EAGER_OPTIONS.intersection(argv)
+    if eager:
+        return {_FLAG_OPTIONS[arg]: True for arg in eager}, []
+
+    options: dict[str, str | bool] = {}
+    claude_args = []
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        name, sep, value = arg.partition("=")
+
+        if arg in _FLAG_OPTIONS:
+            options[_FLAG_OPTIONS[arg]] = True
+        elif name in _VALUE_OPTIONS:
+            if not sep:
+                i += 1
+                if i >= len(argv):
+                    sys.stderr.write(f"Error: Option '{name}' requires an argument.\n")
+                    raise SystemExit(2)
+                value = argv[i]
+            options[_VALUE_OPTIONS[name]] = value
+        else:
+            claude_args.append(arg)
+        i += 1
+
+    return options, claude_args
 
 
 def show_config() -> None:
     """Show current configuration and environment."""
+    from rich.table import Table  # noqa: PLC0415
+
     table = Table(title="Configuration", show_header=True)
     table.add_column("Setting", style="cyan")
     table.add_column("Value", style="green")
@@ -91,7 +201,7 @@ def show_config() -> None:
     else:
         table.add_row("MCP Config", "Not found", "N/A")
 
-    console.print(table)
+    _get_console().print(table)
 
 
 def parse_claude_args(
@@ -116,6 +226,16 @@ def parse_claude_args(
     if args is None or len(args) == 0:
         return None, {}
 
+    prompt, extra_args = _parse_claude_args_cached(tuple(args))
+    # Copy so callers can add flags without corrupting the cache
+    return prompt, dict(extra_args)
+
+
+@lru_cache(maxsize=128)
+def _parse_claude_args_cached(
+    args: tuple[str, ...],
+) -> tuple[str | None, dict[str, str | None]]:
+    """Parse a non-empty args tuple; see parse_claude_args."""
     # Find the last non-option argument (the prompt)
     prompt = None
     claude_args = list(args)
@@ -125,31 +245,32 @@ def parse_claude_args(
             prompt = claude_args.pop(i)
             break
 
-    # Parse flags into dict for SDK
+    # Parse flags into dict for SDK in one pass. A flag without an inline value
+    # stays pending until we see whether the next arg is its value.
     extra_args = {}
-    i = 0
-    while i < len(claude_args):
-        arg = claude_args[i]
-
-        if "=" in arg:
-            # --flag=value format
-            key, value = arg.lstrip("-").split("=", 1)
-            extra_args[key] = value
-            i += 1
-        elif i + 1 < len(claude_args) and not claude_args[i + 1].startswith("-"):
+    pending = None
+    for arg in claude_args:
+        if pending is not None and not arg.startswith("-"):
             # --flag value format (next arg is not a flag)
-            extra_args[arg.lstrip("-")] = claude_args[i + 1]
-            i += 2
-        else:
-            # --flag standalone (boolean flag)
-            extra_args[arg.lstrip("-")] = None
-            i += 1
+            extra_args[pending] = arg
+            pending = None
+            continue
+
+        # --flag=value format, or --flag standalone (boolean flag) for now
+        key, value = _FLAG_RE.fullmatch(arg).groups()
+        extra_args[key] = value
+        pending = key if value is None else None
 
     return prompt, extra_args
 
 
 def show_startup_banner(extra_args: dict[str, str | None]) -> None:
     """Show a fancy startup banner."""
+    from rich.panel import Panel  # noqa: PLC0415
+    from rich.table import Table  # noqa: PLC0415
+
+    console = _get_console()
+
     # Create configuration table
     table = Table(show_header=False, box=None, padding=(0, 1))
     table.add_column("Key", style="cyan")
@@ -167,12 +288,7 @@ def show_startup_banner(extra_args: dict[str, str | None]) -> None:
     table.add_row("MCP", "Via Claude Code config")
 
     # Check telemetry backend
-    if os.getenv("LOGFIRE_TOKEN"):
-        table.add_row("Telemetry", "🔥 Logfire")
-    elif os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
-        table.add_row("Telemetry", "📊 OpenTelemetry")
-    else:
-        table.add_row("Telemetry", "⚠️  None (debug mode)")
+    table.add_row("Telemetry", _BACKEND_LABELS[_telemetry_backend()])
 
     # Show banner
     console.print()
@@ -189,85 +305,31 @@ def show_startup_banner(extra_args: dict[str, str | None]) -> None:
     console.print()
 
 
-@app.command(
-    context_settings={"ignore_unknown_options": True},
-    help="""
-    [bold]🤖 Claude agent with OpenTelemetry instrumentation[/bold]
-
-    Claudia is a thin wrapper around Claude CLI that adds telemetry.
-    All Claude CLI flags are supported - just pass them through.
-
-    [bold]Examples:[/bold]
-
-      # Single prompt (recommended: use = for flags)
-      claudia --permission-mode=bypassPermissions "fix this"
-
-      # With specific model and Logfire telemetry
-      claudia --model=opus --logfire-token YOUR_TOKEN "review my code"
-
-      # Interactive mode
-      claudia
-
-      # Multiple flags
-      claudia --model=opus --debug=api "analyze my code"
-
-    [bold]Note:[/bold] For flags that take values, the --flag=value format
-    is recommended to avoid ambiguity with the prompt argument.
-    """,
-)
-def main(
-    args: Annotated[
-        list[str],
-        typer.Argument(help="Prompt and Claude CLI flags (all pass-through arguments)"),
-    ] = None,
-    logfire_token: Annotated[
-        str | None,
-        typer.Option(
-            "--logfire-token",
-            help="Logfire API token (or set LOGFIRE_TOKEN env var)",
-            envvar="LOGFIRE_TOKEN",
-        ),
-    ] = None,
-    otel_endpoint: Annotated[
-        str | None,
-        typer.Option(
-            "--otel-endpoint",
-            help="OTEL endpoint URL",
-            envvar="OTEL_EXPORTER_OTLP_ENDPOINT",
-        ),
-    ] = None,
-    otel_headers: Annotated[
-        str | None,
-        typer.Option(
-            "--otel-headers",
-            help="OTEL headers (format: key1=value1,key2=value2)",
-            envvar="OTEL_EXPORTER_OTLP_HEADERS",
-        ),
-    ] = None,
-    claudia_debug: Annotated[
-        bool, typer.Option("--claudia-debug", help="Enable claudia debug output")
-    ] = False,
-    version: Annotated[
-        bool | None,
-        typer.Option(
-            "--version",
-            "-v",
-            callback=version_callback,
-            is_eager=True,
-            help="Show version and exit",
-        ),
-    ] = None,
-    config: Annotated[
-        bool | None,
-        typer.Option(
-            "--config",
-            callback=config_callback,
-            is_eager=True,
-            help="Show configuration and exit",
-        ),
-    ] = None,
-) -> None:
+def main(argv: list[str] | None = None) -> None:
     """Main CLI entry point."""
+    options, args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if options.get("help"):
+        show_help()
+        return
+    if options.get("version"):
+        # Resolving the version imports importlib.metadata, so only do it here
+        from claude_telemetry import __version__  # noqa: PLC0415
+
+        sys.stdout.write(f"claudia version {__version__}\n")
+        return
+
+    from claude_telemetry.helpers.logger import configure_logger  # noqa: PLC0415
+
+    if options.get("config"):
+        show_config()
+        return
+
+    logfire_token = options.get("logfire_token")
+    otel_endpoint = options.get("otel_endpoint")
+    otel_headers = options.get("otel_headers")
+    claudia_debug = options.get("claudia_debug", False)
+
     # Set telemetry env vars
     if logfire_token:
         os.environ["LOGFIRE_TOKEN"] = logfire_token
@@ -280,6 +342,7 @@ def main(
         configure_logger(debug=True)
 
     # Parse arguments into prompt and Claude CLI flags
+    console = _get_console()
     if claudia_debug:
         console.print(f"[dim]Debug: raw args = {args}[/dim]")
 
@@ -293,6 +356,8 @@ def main(
     use_interactive = prompt is None
 
     if use_interactive:
+        from claude_telemetry.sync import run_agent_interactive_sync  # noqa: PLC0415
+
         # Show fancy startup banner
         show_startup_banner(extra_args)
 
@@ -306,6 +371,8 @@ def main(
             handle_agent_error(e)
 
     else:
+        from claude_telemetry.sync import run_agent_with_telemetry_sync  # noqa: PLC0415
+
         # Single prompt mode
         try:
             run_agent_with_telemetry_sync(
@@ -318,4 +385,4 @@ def main(
 
 
 if __name__ == "__main__":
-    app()
+    main()
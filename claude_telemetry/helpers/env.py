@@ -0,0 +1,32 @@
+"""Environment variable parsing."""
+
+import os
+
+from claude_telemetry.helpers.logger import logger
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Read an integer setting from the environment.
+
+    Unset or empty variables use the default. Invalid values log a warning and
+    also fall back to the default, so a typo never stops the agent from running.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or invalid
+
+    Returns:
+        Parsed integer value
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Invalid {}={!r}, using default {}", name, value, default)
+        return default
+
+
+__all__ = ["env_int"]
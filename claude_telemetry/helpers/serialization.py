@@ -0,0 +1,40 @@
+"""JSON serialization for telemetry payloads."""
+
+import json
+from typing import Any
+
+# orjson is optional - it's several times faster than the stdlib encoder on
+# the nested dicts/lists tools return, but we don't require it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(value: Any, indent: bool = False) -> str:
+    """
+    Serialize a value to a JSON string.
+
+    Uses orjson when installed, falling back to the standard library for
+    values orjson rejects (e.g. integers beyond 64 bits). Values that aren't
+    JSON serializable are converted with str().
+
+    Args:
+        value: Value to serialize
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=str, option=option).decode()
+        except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+            pass
+    return json.dumps(value, indent=2 if indent else None, default=str)
+
+
+__all__ = ["dumps"]
@@ -1,14 +1,25 @@
 """Claude SDK hooks for telemetry capture."""
 
-from typing import Any
-import json
+import asyncio
+import os
+import random
+from typing import TYPE_CHECKING, Any
 import time
 
 from opentelemetry import trace
 
+from claude_telemetry.helpers.env import env_int
 from claude_telemetry.helpers.logger import logger
-from claude_telemetry.logfire_adapter import get_logfire
-from claude_telemetry.sentry_adapter import get_sentry
+from claude_telemetry.helpers.serialization import dumps
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace.sampling import Sampler
+
+# Span names are fixed so backends can group spans; per-call details go in
+# the display_name attribute, and in logfire.msg, which Logfire shows as the
+# span's title
+_SESSION_SPAN_NAME = "agent_session"
+_TOOL_SPAN_NAME = "tool_call"
 
 
 def _truncate_for_display(text: str, max_length: int = 200) -> str:
@@ -415,13 +426,82 @@ def add_response_to_event_data(  # noqa: PLR0915
             event_data["response"] = response_str
 
 
+def _response_status(tool_response: Any) -> str:
+    """Return "error" or "success" for a tool response without recording it."""
+    if isinstance(tool_response, dict) and (
+        tool_response.get("error") or tool_response.get("isError")
+    ):
+        return "error"
+    return "success"
+
+
+def _sampler_from_env() -> "Sampler | None":
+    """
+    Build a ratio sampler from CLAUDE_TELEMETRY_SAMPLE_RATE.
+
+    Returns None (trace every session) when the variable is unset, or when it
+    isn't a number between 0 and 1 - a typo shouldn't stop the agent running.
+    """
+    rate = os.getenv("CLAUDE_TELEMETRY_SAMPLE_RATE")
+    if not rate:
+        return None
+
+    # Only pull in the SDK sampler when sampling is actually configured
+    from opentelemetry.sdk.trace.sampling import TraceIdRatioBased  # noqa: PLC0415
+
+    try:
+        return TraceIdRatioBased(float(rate))
+    except ValueError:
+        logger.warning(
+            "Invalid CLAUDE_TELEMETRY_SAMPLE_RATE={!r} (expected 0.0-1.0), "
+            "tracing every session",
+            rate,
+        )
+        return None
+
+
+def _report_flush_error(future: asyncio.Future) -> None:
+    """Log a failed background flush instead of leaving it unretrieved."""
+    if not future.cancelled() and future.exception():
+        logger.error("❌ Failed to flush telemetry: {}", future.exception())
+
+
 class TelemetryHooks:
     """Hooks for capturing Claude agent telemetry."""
 
+    # Longest string recorded as a single tool response attribute or event
+    MAX_ATTR_LENGTH = env_int("CLAUDE_TELEMETRY_MAX_ATTR", 10000)
+    # Set CLAUDE_TELEMETRY_CAPTURE_RESPONSES=0 to record only tool status,
+    # never response content
+    CAPTURE_RESPONSES = os.getenv(
+        "CLAUDE_TELEMETRY_CAPTURE_RESPONSES", "1"
+    ).lower() not in ("0", "false", "no")
+    # Cumulative token usage is written to the session span on the first turn
+    # and every N turns after; complete_session() always writes the final totals
+    USAGE_UPDATE_INTERVAL = max(1, env_int("CLAUDE_TELEMETRY_USAGE_UPDATE_INTERVAL", 4))
+
+    __slots__ = (
+        "_sampler",
+        "_telemetry_enabled",
+        "_unique_tools",
+        "create_tool_spans",
+        "input_tokens",
+        "model",
+        "output_tokens",
+        "prompt",
+        "session_span",
+        "start_ns",
+        "tool_spans",
+        "tools_used",
+        "tracer",
+        "turns",
+    )
+
     def __init__(
         self,
         tracer_name: str = "claude-telemetry",
         create_tool_spans: bool = False,
+        sampler: "Sampler | None" = None,
     ):
         """
         Initialize hooks with a tracer.
@@ -430,22 +510,25 @@ class TelemetryHooks:
             tracer_name: Name for the OpenTelemetry tracer
             create_tool_spans: If True, create child spans for each tool.
                               If False (default), add tool data as events only.
+            sampler: Head sampler deciding whether each session is traced.
+                     Defaults to TraceIdRatioBased(CLAUDE_TELEMETRY_SAMPLE_RATE)
+                     when that variable is set, otherwise every session is.
         """
         self.tracer = trace.get_tracer(tracer_name)
+        self._sampler = sampler if sampler is not None else _sampler_from_env()
+        # Without an SDK provider every span operation is a no-op, so skip
+        # building attributes and events entirely
+        self._telemetry_enabled = not isinstance(
+            trace.get_tracer_provider(),
+            (trace.NoOpTracerProvider, trace.ProxyTracerProvider),
+        )
         self.session_span = None
         self.tool_spans = {}
-        # Initialize metrics with all required keys so methods can safely access them
-        self.metrics = {
-            "prompt": "",
-            "model": "unknown",
-            "input_tokens": 0,
-            "output_tokens": 0,
-            "tools_used": 0,
-            "turns": 0,
-            "start_time": 0.0,
-        }
-        self.messages = []
-        self.tools_used = []
+        # Session metrics live in slots rather than a dict - they're updated on
+        # every tool call and turn
+        self._reset_metrics()
+        # Distinct tool names, kept up to date so completion needn't rebuild it
+        self._unique_tools: set[str] = set()
         self.create_tool_spans = create_tool_spans
 
     async def on_user_prompt_submit(
@@ -468,25 +551,21 @@ class TelemetryHooks:
             else "unknown"
         )
 
-        # Initialize metrics
-        self.metrics = {
-            "prompt": prompt,
-            "model": model,
-            "input_tokens": 0,
-            "output_tokens": 0,
-            "tools_used": 0,
-            "turns": 0,
-            "start_time": time.time(),
-        }
-
-        # Create span title with prompt preview
+        self._reset_metrics(prompt, model, time.monotonic_ns())
+
+        if not self._telemetry_enabled or not self._should_sample():
+            # Untraced session - every span operation below becomes a no-op
+            self.session_span = trace.INVALID_SPAN
+            return {}
+
         prompt_preview = prompt[:60] + "..." if len(prompt) > 60 else prompt
-        span_title = f"🤖 {prompt_preview}"
 
         # Start session span
         self.session_span = self.tracer.start_span(
-            span_title,
+            _SESSION_SPAN_NAME,
             attributes={
+                "display_name": prompt_preview,
+                "logfire.msg": prompt_preview,
                 "prompt": prompt,
                 "model": model,
                 "session_id": input_data["session_id"],
@@ -495,12 +574,9 @@ class TelemetryHooks:
         )
 
         # Add user prompt event
-        self.session_span.add_event("👤 User prompt submitted", {"prompt": prompt})
-
-        # Store message
-        self.messages.append({"role": "user", "content": prompt})
+        self.session_span.add_event("User prompt submitted", {"prompt": prompt})
 
-        logger.debug(f"🎯 Span created: {span_title}")
+        logger.debug("🎯 Span created: {}", prompt_preview)
 
         return {}
 
@@ -519,42 +595,57 @@ class TelemetryHooks:
             raise RuntimeError(msg)
 
         # Track usage
-        self.tools_used.append(tool_name)
-        self.metrics["tools_used"] += 1
+        self._unique_tools.add(tool_name)
+        self.tools_used += 1
 
-        # Console logging with smart formatting
+        # Console logging with smart formatting. The multi-line input is only
+        # formatted when a sink will actually emit it.
         tool_title = create_tool_title(tool_name, tool_input)
-        logger.info(f"🔧 Tool: {tool_title}")
+        logger.info("🔧 Tool: {}", tool_title)
         if tool_input:
-            formatted_input = _format_tool_input_for_console(tool_input)
-            logger.info(f"   Input:\n{formatted_input}")
+            logger.opt(lazy=True).info(
+                "   Input:\n{}", lambda: _format_tool_input_for_console(tool_input)
+            )
 
-        if self.create_tool_spans:
+        # Disabled and unsampled sessions hold INVALID_SPAN, so this one check
+        # covers both
+        if not self.session_span.is_recording():
+            return {}
+
+        # A child span can only be matched to its post-tool hook by id, so
+        # tools without one are recorded as session events instead
+        if self.create_tool_spans and tool_use_id:
             # Create child span for tool
             ctx_token = trace.set_span_in_context(self.session_span)
             tool_span = self.tracer.start_span(
-                f"🔧 {tool_title}",
+                _TOOL_SPAN_NAME,
                 attributes={
+                    "display_name": tool_title,
+                    "logfire.msg": tool_title,
                     "tool.name": tool_name,
                     "gen_ai.operation.name": "execute_tool",  # For Sentry LLM UI
                 },
                 context=ctx_token,
             )
 
+            # Store span first so it's always ended, even if recording the
+            # input below fails
+            self.tool_spans[tool_use_id] = tool_span
+
             # Add tool input as attributes
-            if tool_input:
+            if tool_input and tool_span.is_recording():
                 for key, val in tool_input.items():
                     if isinstance(val, str) and len(val) < 100:
                         tool_span.set_attribute(f"tool.input.{key}", val)
-                tool_span.add_event("Tool input", {"input": str(tool_input)[:500]})
-
-            # Store span
-            tool_id = tool_use_id or f"{tool_name}_{time.time()}"
-            self.tool_spans[tool_id] = tool_span
+                try:
+                    input_json = dumps(tool_input)
+                except Exception:
+                    input_json = str(tool_input)
+                tool_span.add_event("Tool input", {"input": input_json[:500]})
         else:
             # Just add event to session span (no child span)
             event_data = create_event_data(tool_name, tool_input)
-            self.session_span.add_event(f"🔧 Tool started: {tool_title}", event_data)
+            self.session_span.add_event(f"Tool started: {tool_title}", event_data)
 
         return {}
 
@@ -567,107 +658,107 @@ class TelemetryHooks:
         """Hook called after tool execution."""
         tool_name = input_data["tool_name"]
         tool_response = input_data.get("tool_response")
+        session_span = self.session_span
 
         # Console logging with smart formatting
         completion_title = create_completion_title(tool_name, tool_response)
-        logger.info(f"✅ Tool completed: {completion_title}")
-        formatted_response = _format_tool_response_for_console(tool_response)
-        logger.info(f"   {formatted_response}")
+        logger.info("✅ Tool completed: {}", completion_title)
+        logger.opt(lazy=True).info(
+            "   {}", lambda: _format_tool_response_for_console(tool_response)
+        )
 
-        if not self.create_tool_spans:
+        if not session_span or not session_span.is_recording():
+            return {}
+
+        if not self.create_tool_spans or not tool_use_id:
             # No child spans - add response data as event to session span
             event_data = {"tool_name": tool_name}
-            add_response_to_event_data(event_data, tool_response)
+            if self.CAPTURE_RESPONSES:
+                add_response_to_event_data(event_data, tool_response)
+            else:
+                event_data["status"] = _response_status(tool_response)
 
-            event_title = f"✅ Tool completed: {completion_title}"
-            self.session_span.add_event(event_title, event_data)
+            event_title = f"Tool completed: {completion_title}"
+            session_span.add_event(event_title, event_data)
             return {}
 
-        # Child span mode - find and close the span
-        span = None
-        span_id = None
-
-        if tool_use_id and tool_use_id in self.tool_spans:
-            span = self.tool_spans[tool_use_id]
-            span_id = tool_use_id
-        else:
-            # Fall back to name matching for most recent
-            for tid, s in reversed(list(self.tool_spans.items())):
-                if tid.startswith(f"{tool_name}_") or tid == tool_use_id:
-                    span = s
-                    span_id = tid
-                    break
+        # Child span mode - find the span and stop tracking it
+        span = self.tool_spans.pop(tool_use_id, None)
 
         if not span:
-            logger.error(f"❌ No span found for tool: {tool_name} (id: {tool_use_id})")
-            logger.error(f"   Active spans: {list(self.tool_spans.keys())}")
-            logger.error("   Span was never created or already closed!")
+            logger.error(
+                "❌ No span found for tool: {} (id: {}) - "
+                "span was never created or already closed",
+                tool_name,
+                tool_use_id,
+            )
             return {}
 
         # Wrap span operations in try/finally to ALWAYS close the span
         try:
-            # Add response as span attributes for visibility in Logfire
-            if tool_response is not None:
+            # Add response as span attributes for visibility in Logfire.
+            # Skip the work entirely when the span is being sampled out.
+            if tool_response is not None and span.is_recording():
+                capture = self.CAPTURE_RESPONSES
+                max_length = self.MAX_ATTR_LENGTH
+                response_str = None
+
                 # Handle dict responses properly - extract key fields
                 if isinstance(tool_response, dict):
-                    # Set individual fields as attributes for better visibility
-                    for key, value in tool_response.items():
-                        # Limit attribute size to avoid OTEL limits
-                        value_str = str(value)
-                        if len(value_str) < 10000:
-                            span.set_attribute(f"tool.response.{key}", value_str)
+                    if capture:
+                        # Set individual fields as attributes for visibility
+                        for key, value in tool_response.items():
+                            # Truncate to stay within backend attribute limits
+                            span.set_attribute(
+                                f"tool.response.{key}", str(value)[:max_length]
+                            )
 
                     # Check for errors - crash loudly if malformed
                     if "error" in tool_response and tool_response["error"]:
                         error_msg = str(tool_response["error"])
-                        span.set_attribute("tool.error", error_msg)
+                        if capture:
+                            span.set_attribute("tool.error", error_msg[:max_length])
                         span.set_attribute("tool.status", "error")
-                        logger.error(f"❌ Tool error: {tool_name}")
-                        logger.error(f"   Error: {error_msg}")
+                        logger.error("❌ Tool error: {}", tool_name)
+                        logger.error("   Error: {}", error_msg)
                     elif "isError" in tool_response and tool_response["isError"]:
                         span.set_attribute("tool.is_error", True)
                         span.set_attribute("tool.status", "error")
-                        logger.error(f"❌ Tool failed: {tool_name}")
+                        logger.error("❌ Tool failed: {}", tool_name)
                     else:
                         span.set_attribute("tool.status", "success")
                 else:
-                    # Non-dict response - treat as string
-                    response_str = str(tool_response)
-                    span.set_attribute("tool.response", response_str[:10000])
                     span.set_attribute("tool.status", "success")
+                    if capture:
+                        # Non-dict response - treat as string, converting once
+                        response_str = str(tool_response)
+                        span.set_attribute("tool.response", response_str[:max_length])
 
                 # Add full response as event for timeline view
-                try:
-                    response_json = (
-                        json.dumps(tool_response, indent=2)
-                        if isinstance(tool_response, (dict, list))
-                        else str(tool_response)
-                    )
-                    if len(response_json) > 2000:
-                        span.add_event(
-                            "Tool response", {"response": response_json[:2000] + "..."}
+                if capture:
+                    try:
+                        # Strings go straight through; only structured
+                        # responses need serializing
+                        response_json = (
+                            response_str
+                            if isinstance(tool_response, str)
+                            else dumps(tool_response, indent=True)
                         )
-                    else:
-                        span.add_event("Tool response", {"response": response_json})
-                except Exception:
+                    except Exception:
+                        response_json = response_str or str(tool_response)
                     span.add_event(
-                        "Tool response", {"response": str(tool_response)[:2000]}
+                        "Tool response", {"response": response_json[:max_length]}
                     )
         finally:
             # ALWAYS end the span, even if there was an error
             try:
                 span.end()
-                logger.debug(f"   Span closed for {tool_name}")
+                logger.debug("   Span closed for {}", tool_name)
             except Exception as e:
-                logger.error(f"   Error closing span for {tool_name}: {e}")
-
-            # Remove from tracking dict
-            if span_id and span_id in self.tool_spans:
-                del self.tool_spans[span_id]
+                logger.error("   Error closing span for {}: {}", tool_name, e)
 
         # Add event to session span
-        if self.session_span:
-            self.session_span.add_event(f"Tool completed: {completion_title}")
+        session_span.add_event(f"Tool completed: {completion_title}")
 
         return {}
 
@@ -677,39 +768,43 @@ class TelemetryHooks:
         ctx: Any,
     ) -> dict[str, Any]:
         """Hook called when assistant message is complete - updates token counts."""
-        # Extract token usage
-        if hasattr(message, "usage"):
-            input_tokens = getattr(message.usage, "input_tokens", 0)
-            output_tokens = getattr(message.usage, "output_tokens", 0)
-
-            self.metrics["input_tokens"] += input_tokens
-            self.metrics["output_tokens"] += output_tokens
-            self.metrics["turns"] += 1
-
-            # Update span with cumulative token usage
-            if self.session_span:
-                self.session_span.set_attribute(
-                    "gen_ai.usage.input_tokens", self.metrics["input_tokens"]
-                )
-                self.session_span.set_attribute(
-                    "gen_ai.usage.output_tokens", self.metrics["output_tokens"]
-                )
-                self.session_span.set_attribute("turns", self.metrics["turns"])
+        # Extract token usage - both counts are normally present, so try direct
+        # access first and only fall back to defaults when one is missing
+        usage = getattr(message, "usage", None)
+        if usage is not None:
+            try:
+                input_tokens = usage.input_tokens
+                output_tokens = usage.output_tokens
+            except AttributeError:
+                input_tokens = getattr(usage, "input_tokens", 0)
+                output_tokens = getattr(usage, "output_tokens", 0)
+
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.turns += 1
+
+            session_span = self.session_span
+            if session_span and session_span.is_recording():
+                # Update span with cumulative token usage
+                if (self.turns - 1) % self.USAGE_UPDATE_INTERVAL == 0:
+                    session_span.set_attributes(
+                        {
+                            "gen_ai.usage.input_tokens": self.input_tokens,
+                            "gen_ai.usage.output_tokens": self.output_tokens,
+                            "turns": self.turns,
+                        }
+                    )
 
                 # Add event for this turn with incremental tokens
-                self.session_span.add_event(
+                session_span.add_event(
                     "Turn completed",
                     {
-                        "turn": self.metrics["turns"],
+                        "turn": self.turns,
                         "input_tokens": input_tokens,
                         "output_tokens": output_tokens,
                     },
                 )
 
-        # Store message
-        if hasattr(message, "content"):
-            self.messages.append({"role": "assistant", "content": message.content})
-
         return {}
 
     async def on_pre_compact(
@@ -719,43 +814,122 @@ class TelemetryHooks:
         ctx: Any,
     ) -> dict[str, Any]:
         """Hook called before context window compaction."""
-        trigger = input_data.get("trigger", "unknown")
-        custom_instructions = input_data.get("custom_instructions")
+        if not self.session_span or not self.session_span.is_recording():
+            return {}
 
-        if self.session_span:
-            self.session_span.add_event(
-                "Context compaction",
-                {
-                    "trigger": trigger,
-                    "has_custom_instructions": custom_instructions is not None,
-                },
-            )
+        custom_instructions = input_data.get("custom_instructions")
+        self.session_span.add_event(
+            "Context compaction",
+            {
+                "trigger": input_data.get("trigger", "unknown"),
+                "has_custom_instructions": custom_instructions is not None,
+            },
+        )
 
         return {}
 
-    def complete_session(self) -> None:
-        """Complete and flush the telemetry session."""
+    def complete_session(self) -> asyncio.Future | None:
+        """
+        Complete and flush the telemetry session.
+
+        The hooks are reset before flushing so they can be reused right away.
+        Inside a running event loop the flush runs on the loop's default
+        executor instead of blocking the caller on network export.
+
+        Returns:
+            Future for the background flush, or None if the flush already ran
+            inline (no running loop) or telemetry is disabled
+        """
         if not self.session_span:
             msg = "No active session span"
             raise RuntimeError(msg)
 
         # Set final attributes
-        self.session_span.set_attribute("gen_ai.request.model", self.metrics["model"])
-        self.session_span.set_attribute("gen_ai.response.model", self.metrics["model"])
-        self.session_span.set_attribute("tools_used", self.metrics["tools_used"])
-
-        if self.tools_used:
-            self.session_span.set_attribute(
-                "tool_names", ",".join(set(self.tools_used))
-            )
+        if self.session_span.is_recording():
+            attributes = {
+                "gen_ai.request.model": self.model,
+                "gen_ai.response.model": self.model,
+                "gen_ai.usage.input_tokens": self.input_tokens,
+                "gen_ai.usage.output_tokens": self.output_tokens,
+                "turns": self.turns,
+                "tools_used": self.tools_used,
+            }
+            if self._unique_tools:
+                attributes["tool_names"] = ",".join(self._unique_tools)
+            self.session_span.set_attributes(attributes)
+
+        # End tool spans that never got a matching post-tool hook
+        for tool_span in self.tool_spans.values():
+            tool_span.end()
 
         # Add completion event
-        self.session_span.add_event("🎉 Completed")
+        self.session_span.add_event("Completed")
 
         # End span
         self.session_span.end()
 
+        # Log summary
+        duration = (time.monotonic_ns() - self.start_ns) / 1e9
+        logger.info(
+            "✅ Session completed | {} in, {} out | {} tools | {:.1f}s",
+            self.input_tokens,
+            self.output_tokens,
+            self.tools_used,
+            duration,
+        )
+
+        # Reset
+        self.session_span = None
+        self.tool_spans.clear()
+        self._reset_metrics()
+        self._unique_tools.clear()
+
         # Flush telemetry to backend
+        if not self._telemetry_enabled:
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush()
+            return None
+        future = loop.run_in_executor(None, self._flush)
+        future.add_done_callback(_report_flush_error)
+        return future
+
+    def _reset_metrics(
+        self, prompt: str = "", model: str = "unknown", start_ns: int = 0
+    ) -> None:
+        """Reset the per-session metrics for a new session."""
+        self.prompt = prompt
+        self.model = model
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.tools_used = 0
+        self.turns = 0
+        self.start_ns = start_ns
+
+    def _should_sample(self) -> bool:
+        """Make the head sampling decision for a new session."""
+        if self._sampler is None:
+            return True
+        result = self._sampler.should_sample(
+            parent_context=None,
+            trace_id=random.getrandbits(128),
+            name=_SESSION_SPAN_NAME,
+        )
+        if result.decision.is_sampled():
+            return True
+        logger.debug("Session not sampled - skipping span creation")
+        return False
+
+    @staticmethod
+    def _flush() -> None:
+        """Flush pending spans to whichever backend is configured."""
+        # The adapters pull in the OpenTelemetry SDK, which hooks otherwise
+        # don't need, so import them here
+        from claude_telemetry.logfire_adapter import get_logfire  # noqa: PLC0415
+        from claude_telemetry.sentry_adapter import get_sentry  # noqa: PLC0415
+
         logfire = get_logfire()
         sentry = get_sentry()
 
@@ -768,17 +942,11 @@ class TelemetryHooks:
             if hasattr(tracer_provider, "force_flush"):
                 tracer_provider.force_flush()
 
-        # Log summary
-        duration = time.time() - self.metrics["start_time"]
-        logger.info(
-            f"✅ Session completed | {self.metrics['input_tokens']} in, "
-            f"{self.metrics['output_tokens']} out | "
-            f"{self.metrics['tools_used']} tools | {duration:.1f}s"
-        )
 
-        # Reset
-        self.session_span = None
-        self.tool_spans = {}
-        self.metrics = {}
-        self.messages = []
-        self.tools_used = []
+__all__ = [
+    "TelemetryHooks",
+    "add_response_to_event_data",
+    "create_completion_title",
+    "create_event_data",
+    "create_tool_title",
+]
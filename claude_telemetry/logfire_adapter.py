@@ -8,12 +8,28 @@ from opentelemetry.sdk.trace import TracerProvider
 from claude_telemetry.helpers.logger import logger
 
 
-def configure_logfire(service_name: str = "claude-agents") -> TracerProvider:
+def configure_logfire(
+    service_name: str = "claude-agents",
+    max_queue_size: int = 4096,
+    schedule_delay_millis: int = 1000,
+    max_export_batch_size: int = 256,
+    export_timeout_millis: int = 10000,
+) -> TracerProvider:
     """
     Configure Logfire for telemetry.
 
+    Logfire builds its own BatchSpanProcessor, which reads the standard
+    OTEL_BSP_* environment variables. The batching arguments are applied
+    through those variables for the duration of ``logfire.configure()``, so
+    values already set in the environment win and nothing leaks to child
+    processes.
+
     Args:
         service_name: Service name for traces
+        max_queue_size: Spans buffered before new ones are dropped
+        schedule_delay_millis: Delay between batch exports
+        max_export_batch_size: Spans sent per export request
+        export_timeout_millis: Timeout for a single export
 
     Returns:
         Configured TracerProvider with Logfire
@@ -29,17 +45,32 @@ def configure_logfire(service_name: str = "claude-agents") -> TracerProvider:
             msg = "LOGFIRE_TOKEN environment variable is not set"
             raise ValueError(msg)  # noqa: TRY301
 
-        # Configure Logfire with service name
-        logfire.configure(
-            service_name=service_name,
-            send_to_logfire=True,
-        )
+        # Batch settings must be in place before Logfire creates its processor.
+        # They are only set while it does, so the environment inherited by the
+        # Claude CLI subprocess is left as the user had it.
+        batch_defaults = {
+            "OTEL_BSP_MAX_QUEUE_SIZE": str(max_queue_size),
+            "OTEL_BSP_SCHEDULE_DELAY": str(schedule_delay_millis),
+            "OTEL_BSP_MAX_EXPORT_BATCH_SIZE": str(max_export_batch_size),
+            "OTEL_BSP_EXPORT_TIMEOUT": str(export_timeout_millis),
+        }
+        added = [name for name in batch_defaults if name not in os.environ]
+        os.environ.update({name: batch_defaults[name] for name in added})
+        try:
+            # Configure Logfire with service name
+            logfire.configure(
+                service_name=service_name,
+                send_to_logfire=True,
+            )
+        finally:
+            for name in added:
+                os.environ.pop(name, None)
 
         # Get the configured tracer provider
         provider = trace.get_tracer_provider()
 
         # Log the Logfire project URL
-        logger.info(f"Logfire configured with service name: {service_name}")
+        logger.info("Logfire configured with service name: {}", service_name)
         logger.info("Note: Token validation happens on first span export")
 
     except Exception:
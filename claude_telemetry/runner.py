@@ -1,14 +1,26 @@
 """Main agent runner with telemetry hooks."""
 
-from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient, HookMatcher
-from opentelemetry.sdk.trace import TracerProvider
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.panel import Panel
+from typing import TYPE_CHECKING
 
 from claude_telemetry.helpers.logger import logger
-from claude_telemetry.hooks import TelemetryHooks
-from claude_telemetry.telemetry import configure_telemetry
+
+# The Claude SDK, OpenTelemetry SDK and Rich are imported inside the runners so
+# importing this module (e.g. for extract_message_text) stays cheap
+if TYPE_CHECKING:
+    from claude_agent_sdk import ClaudeAgentOptions
+    from opentelemetry.sdk.trace import TracerProvider
+    from rich.panel import Panel
+
+    from claude_telemetry.hooks import TelemetryHooks
+
+# SDK hook event -> TelemetryHooks method that handles it
+_HOOK_SPEC = (
+    ("UserPromptSubmit", "on_user_prompt_submit"),
+    ("PreToolUse", "on_pre_tool_use"),
+    ("PostToolUse", "on_post_tool_use"),
+    ("MessageComplete", "on_message_complete"),
+    ("PreCompact", "on_pre_compact"),
+)
 
 
 def extract_message_text(message) -> str:
@@ -41,10 +53,82 @@ def extract_message_text(message) -> str:
         return str(content)
 
 
+def _build_hook_config(hooks: "TelemetryHooks") -> dict[str, list]:
+    """
+    Build the SDK hook configuration that routes every event to the hooks.
+
+    Args:
+        hooks: TelemetryHooks instance shared by all prompts in a session
+
+    Returns:
+        Dict mapping hook event names to HookMatcher lists
+    """
+    from claude_agent_sdk import HookMatcher  # noqa: PLC0415
+
+    return {
+        event: [HookMatcher(matcher=None, hooks=[getattr(hooks, method)])]
+        for event, method in _HOOK_SPEC
+    }
+
+
+def _log_claude_stderr(line: str) -> None:
+    """Log Claude CLI stderr output for debugging."""
+    if line.strip():
+        logger.info("[Claude CLI] {}", line)
+
+
+def _build_options(
+    hooks: "TelemetryHooks",
+    extra_args: dict[str, str | None] | None,
+    debug: bool,
+) -> "ClaudeAgentOptions":
+    """
+    Build the Claude SDK options shared by both runners.
+
+    Args:
+        hooks: TelemetryHooks instance to route hook events to
+        extra_args: Extra arguments to pass to Claude CLI
+        debug: Enable Claude CLI debug mode and log its stderr
+
+    Returns:
+        ClaudeAgentOptions for a ClaudeSDKClient
+    """
+    from claude_agent_sdk import ClaudeAgentOptions  # noqa: PLC0415
+
+    if extra_args is None:
+        extra_args = {}
+
+    # Add debug flag if requested
+    if debug and "debug" not in extra_args:
+        extra_args["debug"] = None
+
+    # Note: Don't pass mcp_servers - let Claude CLI use its own config
+    # IMPORTANT: Must explicitly set setting_sources to load user/project/local settings
+    # SDK defaults to isolated environment (no settings) when None.
+    # We want CLI-like behavior, so explicitly request all sources.
+    return ClaudeAgentOptions(
+        hooks=_build_hook_config(hooks),
+        setting_sources=["user", "project", "local"],
+        extra_args=extra_args,
+        stderr=_log_claude_stderr if debug else None,
+    )
+
+
+def _format_summary(prompts_count: int) -> "Panel":
+    """Build the panel shown when an interactive session ends."""
+    from rich.panel import Panel  # noqa: PLC0415
+
+    return Panel.fit(
+        f"[bold]Session Summary[/bold]\nPrompts: {prompts_count}",
+        title="📊 Metrics",
+        border_style="green",
+    )
+
+
 async def run_agent_with_telemetry(
     prompt: str,
     extra_args: dict[str, str | None] | None = None,
-    tracer_provider: TracerProvider | None = None,
+    tracer_provider: "TracerProvider | None" = None,
     debug: bool = False,
 ) -> dict[str, str]:
     """
@@ -66,48 +150,19 @@ async def run_agent_with_telemetry(
         MCP servers configured via `claude mcp add` will be automatically available.
         Pass any Claude CLI flag via extra_args.
     """
-    if extra_args is None:
-        extra_args = {}
+    from claude_agent_sdk import ClaudeSDKClient  # noqa: PLC0415
+    from rich.console import Console  # noqa: PLC0415
+
+    from claude_telemetry.hooks import TelemetryHooks  # noqa: PLC0415
+    from claude_telemetry.telemetry import configure_telemetry  # noqa: PLC0415
+
     # Configure telemetry
     configure_telemetry(tracer_provider)
 
     # Initialize hooks
     hooks = TelemetryHooks()
 
-    # Create hook configuration
-    hook_config = {
-        "UserPromptSubmit": [
-            HookMatcher(matcher=None, hooks=[hooks.on_user_prompt_submit])
-        ],
-        "PreToolUse": [HookMatcher(matcher=None, hooks=[hooks.on_pre_tool_use])],
-        "PostToolUse": [HookMatcher(matcher=None, hooks=[hooks.on_post_tool_use])],
-        "MessageComplete": [
-            HookMatcher(matcher=None, hooks=[hooks.on_message_complete])
-        ],
-        "PreCompact": [HookMatcher(matcher=None, hooks=[hooks.on_pre_compact])],
-    }
-
-    # Add debug flag if requested
-    if debug and "debug" not in extra_args:
-        extra_args["debug"] = None
-
-    # Callback for stderr output from Claude CLI
-    def log_claude_stderr(line: str) -> None:
-        """Log Claude CLI stderr output for debugging."""
-        if line.strip():
-            logger.info(f"[Claude CLI] {line}")
-
-    # Create agent options with hooks
-    # Note: Don't pass mcp_servers - let Claude CLI use its own config
-    # IMPORTANT: Must explicitly set setting_sources to load user/project/local settings
-    # SDK defaults to isolated environment (no settings) when None.
-    # We want CLI-like behavior, so explicitly request all sources.
-    options = ClaudeAgentOptions(
-        hooks=hook_config,
-        setting_sources=["user", "project", "local"],
-        extra_args=extra_args,
-        stderr=log_claude_stderr if debug else None,
-    )
+    options = _build_options(hooks, extra_args, debug)
 
     # Use async context manager for proper resource handling
     console = Console()
@@ -134,7 +189,7 @@ async def run_agent_with_telemetry(
 
 async def run_agent_interactive(  # noqa: PLR0915
     extra_args: dict[str, str | None] | None = None,
-    tracer_provider: TracerProvider | None = None,
+    tracer_provider: "TracerProvider | None" = None,
     debug: bool = False,
 ) -> None:
     """
@@ -155,8 +210,14 @@ async def run_agent_interactive(  # noqa: PLR0915
         MCP servers configured via `claude mcp add` will be automatically available.
         Pass any Claude CLI flag via extra_args.
     """
-    if extra_args is None:
-        extra_args = {}
+    from claude_agent_sdk import ClaudeSDKClient  # noqa: PLC0415
+    from rich.console import Console  # noqa: PLC0415
+    from rich.markdown import Markdown  # noqa: PLC0415
+    from rich.panel import Panel  # noqa: PLC0415
+
+    from claude_telemetry.hooks import TelemetryHooks  # noqa: PLC0415
+    from claude_telemetry.telemetry import configure_telemetry  # noqa: PLC0415
+
     console = Console()
 
     # Configure telemetry once for the session
@@ -165,47 +226,13 @@ async def run_agent_interactive(  # noqa: PLR0915
     # This banner is now handled by CLI layer
 
     # Interactive loop
-    session_metrics = {
-        "total_input_tokens": 0,
-        "total_output_tokens": 0,
-        "total_tools_used": 0,
-        "prompts_count": 0,
-    }
+    prompts_count = 0
 
     # Initialize hooks once for the session
     hooks = TelemetryHooks()
 
-    # Add debug flag if requested
-    if debug and "debug" not in extra_args:
-        extra_args["debug"] = None
-
-    # Callback for stderr output from Claude CLI
-    def log_claude_stderr(line: str) -> None:
-        """Log Claude CLI stderr output for debugging."""
-        if line.strip():
-            logger.info(f"[Claude CLI] {line}")
-
-    # Create options with hooks
-    # Note: Don't pass mcp_servers - let Claude CLI use its own config
-    # IMPORTANT: Must explicitly set setting_sources to load user/project/local settings
-    # SDK defaults to isolated environment (no settings) when None.
-    # We want CLI-like behavior, so explicitly request all sources.
-    options = ClaudeAgentOptions(
-        setting_sources=["user", "project", "local"],
-        extra_args=extra_args,
-        stderr=log_claude_stderr if debug else None,
-        hooks={
-            "UserPromptSubmit": [
-                HookMatcher(matcher=None, hooks=[hooks.on_user_prompt_submit])
-            ],
-            "PreToolUse": [HookMatcher(matcher=None, hooks=[hooks.on_pre_tool_use])],
-            "PostToolUse": [HookMatcher(matcher=None, hooks=[hooks.on_post_tool_use])],
-            "MessageComplete": [
-                HookMatcher(matcher=None, hooks=[hooks.on_message_complete])
-            ],
-            "PreCompact": [HookMatcher(matcher=None, hooks=[hooks.on_pre_compact])],
-        },
-    )
+    # Options are built once - the same hooks serve every prompt in the session
+    options = _build_options(hooks, extra_args, debug)
 
     # Use async context manager for the session
     async with ClaudeSDKClient(options=options) as client:
@@ -230,28 +257,24 @@ async def run_agent_interactive(  # noqa: PLR0915
                         # Send the query
                         await client.query(prompt=user_input)
 
-                        # Receive responses
-                        response_text = ""
+                        # Show each message as it arrives rather than once the
+                        # turn is over. The SDK yields whole messages, so each
+                        # one gets its own panel between the tool log lines.
                         async for message in client.receive_response():
                             text = extract_message_text(message)
                             if text:
-                                response_text += text
-
-                        # Display response with formatting
-                        if response_text:
-                            console.print(
-                                Panel(
-                                    Markdown(response_text),
-                                    title="Claude",
-                                    border_style="cyan",
+                                console.print(
+                                    Panel(
+                                        Markdown(text),
+                                        title="Claude",
+                                        border_style="cyan",
+                                    )
                                 )
-                            )
 
-                        # Update session metrics
-                        session_metrics["prompts_count"] += 1
+                        prompts_count += 1
 
                     except Exception as e:
-                        logger.exception(f"Error during prompt execution: {e}")
+                        logger.exception("Error during prompt execution: {}", e)
                         console.print(
                             f"[bold red]Error:[/bold red] {e}\n"
                             "[yellow]Continuing session...[/yellow]"
@@ -278,14 +301,5 @@ async def run_agent_interactive(  # noqa: PLR0915
 
         # Show session summary
         console.print("\n" + "=" * 50)
-        console.print(
-            Panel.fit(
-                f"[bold]Session Summary[/bold]\n"
-                f"Prompts: {session_metrics['prompts_count']}\n"
-                f"Total tokens: "
-                f"{session_metrics['total_input_tokens'] + session_metrics['total_output_tokens']}",  # noqa: E501
-                title="📊 Metrics",
-                border_style="green",
-            )
-        )
+        console.print(_format_summary(prompts_count))
         console.print("\nGoodbye! 👋")
@@ -71,8 +71,8 @@ def configure_sentry(service_name: str = "claude-agents") -> TracerProvider:
         # Set as global tracer provider
         trace.set_tracer_provider(provider)
 
-        logger.info(f"Sentry configured with service name: {service_name}")
-        logger.info(f"Environment: {environment}")
+        logger.info("Sentry configured with service name: {}", service_name)
+        logger.info("Environment: {}", environment)
         logger.info("Note: Traces will appear in Sentry's AI Monitoring section")
 
     except ImportError as e:
@@ -1,16 +1,18 @@
 """Synchronous wrappers for async functions."""
 
 import asyncio
-
-from opentelemetry.sdk.trace import TracerProvider
+from typing import TYPE_CHECKING
 
 from claude_telemetry.runner import run_agent_interactive, run_agent_with_telemetry
 
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import TracerProvider
+
 
 def run_agent_with_telemetry_sync(
     prompt: str,
     extra_args: dict[str, str | None] | None = None,
-    tracer_provider: TracerProvider | None = None,
+    tracer_provider: "TracerProvider | None" = None,
     debug: bool = False,
 ) -> None:
     """
@@ -53,7 +55,7 @@ def run_agent_with_telemetry_sync(
 
 def run_agent_interactive_sync(
     extra_args: dict[str, str | None] | None = None,
-    tracer_provider: TracerProvider | None = None,
+    tracer_provider: "TracerProvider | None" = None,
     debug: bool = False,
 ) -> None:
     """
@@ -9,8 +9,19 @@ from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
 
+from claude_telemetry.helpers.env import env_int
 from claude_telemetry.helpers.logger import logger
 
+# Batching for the exporters we build ourselves. Spans queue up and export in
+# the background on a short delay rather than one request per span; the
+# standard OTEL_BSP_* environment variables still take precedence.
+_BSP_DEFAULTS = {
+    "max_queue_size": ("OTEL_BSP_MAX_QUEUE_SIZE", 4096),
+    "schedule_delay_millis": ("OTEL_BSP_SCHEDULE_DELAY", 1000),
+    "max_export_batch_size": ("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", 256),
+    "export_timeout_millis": ("OTEL_BSP_EXPORT_TIMEOUT", 10000),
+}
+
 
 def configure_telemetry(
     tracer_provider: TracerProvider | None = None,
@@ -65,7 +76,7 @@ def configure_telemetry(
                 "Logfire token provided but logfire package not installed"
             ) from e
         except Exception as e:
-            logger.error(f"❌ Failed to configure Logfire: {e}")
+            logger.error("❌ Failed to configure Logfire: {}", e)
             logger.error(
                 "   Check your LOGFIRE_TOKEN is valid at https://logfire.pydantic.dev/"
             )
@@ -86,7 +97,7 @@ def configure_telemetry(
                 "Sentry DSN provided but sentry-sdk package not installed"
             ) from e
         except Exception as e:
-            logger.error(f"❌ Failed to configure Sentry: {e}")
+            logger.error("❌ Failed to configure Sentry: {}", e)
             logger.error("   Check your SENTRY_DSN is valid at https://sentry.io")
             raise RuntimeError(f"Failed to configure Sentry telemetry: {e}") from e
 
@@ -95,11 +106,11 @@ def configure_telemetry(
     if otel_endpoint:
         try:
             provider = _configure_otel(otel_endpoint, service_name)
-            logger.info(f"📊 OpenTelemetry configured → {otel_endpoint}")
+            logger.info("📊 OpenTelemetry configured → {}", otel_endpoint)
             return provider  # noqa: TRY300
         except Exception as e:
-            logger.error(f"❌ Failed to configure OTEL: {e}")
-            logger.error(f"   Check endpoint is reachable: {otel_endpoint}")
+            logger.error("❌ Failed to configure OTEL: {}", e)
+            logger.error("   Check endpoint is reachable: {}", otel_endpoint)
             raise RuntimeError(f"Failed to configure OTEL telemetry: {e}") from e
 
     # No configuration found - use console exporter for debugging
@@ -138,6 +149,17 @@ See https://github.com/TechNickAI/claude_telemetry for more details.
     )
 
 
+def _batch_span_processor(exporter) -> BatchSpanProcessor:
+    """Create a BatchSpanProcessor with our defaults, overridable via OTEL_BSP_*."""
+    return BatchSpanProcessor(
+        exporter,
+        **{
+            arg: env_int(env_var, default)
+            for arg, (env_var, default) in _BSP_DEFAULTS.items()
+        },
+    )
+
+
 def _configure_otel(endpoint: str, service_name: str) -> TracerProvider:
     """Configure standard OTEL exporter."""
     resource = Resource.create({"service.name": service_name})
@@ -161,7 +183,7 @@ def _configure_otel(endpoint: str, service_name: str) -> TracerProvider:
 
     # Create and configure tracer provider
     provider = TracerProvider(resource=resource)
-    processor = BatchSpanProcessor(exporter)
+    processor = _batch_span_processor(exporter)
     provider.add_span_processor(processor)
 
     # Set as global tracer
@@ -175,7 +197,7 @@ def _configure_console_exporter(service_name: str) -> TracerProvider:
     resource = Resource.create({"service.name": service_name})
 
     provider = TracerProvider(resource=resource)
-    processor = BatchSpanProcessor(ConsoleSpanExporter())
+    processor = _batch_span_processor(ConsoleSpanExporter())
     provider.add_span_processor(processor)
 
     trace.set_tracer_provider(provider)
@@ -194,14 +216,14 @@ def safe_span_operation(operation):
         try:
             return operation(*args, **kwargs)
         except Exception as e:
-            logger.warning(f"Telemetry operation failed (ignored): {e}")
+            logger.warning("Telemetry operation failed (ignored): {}", e)
             return None
 
     async def async_wrapper(*args, **kwargs):
         try:
             return await operation(*args, **kwargs)
         except Exception as e:
-            logger.warning(f"Telemetry operation failed (ignored): {e}")
+            logger.warning("Telemetry operation failed (ignored): {}", e)
             return None
 
     # Return appropriate wrapper based on function type
@@ -1,18 +1,42 @@
 """Shared pytest fixtures for claude_telemetry tests."""
 
+import os
+import subprocess
+import sys
+
 from opentelemetry import trace
 from opentelemetry.trace import ProxyTracerProvider
 import pytest
 
 
+def run_python(code: str, cwd=None) -> str:
+    """
+    Run code in a fresh interpreter and return its stripped stdout.
+
+    Used by tests that check what importing a module loads, which can't be
+    observed from inside the already-warm test process.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=cwd,
+    )
+    return result.stdout.strip()
+
+
 @pytest.fixture(autouse=True)
-def reset_environment(monkeypatch):
+def reset_environment(monkeypatch, mocker):
     """
     Reset environment variables before each test.
 
     This ensures tests don't interfere with each other through
     environment state.
     """
+    # Restore the whole environment afterwards, including variables the code
+    # under test sets itself
+    mocker.patch.dict(os.environ)
     # Clear telemetry-related env vars
     monkeypatch.delenv("LOGFIRE_TOKEN", raising=False)
     monkeypatch.delenv("SENTRY_DSN", raising=False)
@@ -1,9 +1,12 @@
 """Tests for CLI commands and error handling."""
 
 import pytest
-import typer
 
-from claude_telemetry.cli import handle_agent_error, show_startup_banner
+from claude_telemetry.cli import (
+    _telemetry_backend,
+    handle_agent_error,
+    show_startup_banner,
+)
 
 
 class TestHandleAgentError:
@@ -11,14 +14,14 @@ class TestHandleAgentError:
 
     def test_handles_keyboard_interrupt(self, mocker):
         """Test that KeyboardInterrupt is displayed nicely."""
-        mock_console = mocker.patch("claude_telemetry.cli.console")
+        mock_console = mocker.patch("claude_telemetry.cli._get_console").return_value
 
         error = KeyboardInterrupt()
 
-        with pytest.raises(typer.Exit) as exc_info:
+        with pytest.raises(SystemExit) as exc_info:
             handle_agent_error(error)
 
-        assert exc_info.value.exit_code == 0
+        assert exc_info.value.code == 0
         mock_console.print.assert_called_once()
         call_args = mock_console.print.call_args[0][0]
         assert "Interrupted by user" in call_args
@@ -26,14 +29,14 @@ class TestHandleAgentError:
 
     def test_handles_runtime_error(self, mocker):
         """Test that RuntimeError raises Exit with error message."""
-        mock_console = mocker.patch("claude_telemetry.cli.console")
+        mock_console = mocker.patch("claude_telemetry.cli._get_console").return_value
 
         error = RuntimeError("Failed to configure telemetry")
 
-        with pytest.raises(typer.Exit) as exc_info:
+        with pytest.raises(SystemExit) as exc_info:
             handle_agent_error(error)
 
-        assert exc_info.value.exit_code == 1
+        assert exc_info.value.code == 1
         mock_console.print.assert_called_once()
         call_args = mock_console.print.call_args[0][0]
         assert "Failed to configure telemetry" in call_args
@@ -41,37 +44,44 @@ class TestHandleAgentError:
 
     def test_handles_generic_exception(self, mocker):
         """Test that generic exceptions raise Exit with error message."""
-        mock_console = mocker.patch("claude_telemetry.cli.console")
+        mock_console = mocker.patch("claude_telemetry.cli._get_console").return_value
 
         error = ValueError("Invalid input")
 
-        with pytest.raises(typer.Exit) as exc_info:
+        with pytest.raises(SystemExit) as exc_info:
             handle_agent_error(error)
 
-        assert exc_info.value.exit_code == 1
+        assert exc_info.value.code == 1
         mock_console.print.assert_called_once()
         call_args = mock_console.print.call_args[0][0]
         assert "Invalid input" in call_args
 
     def test_exit_code_is_one_for_errors(self, mocker):
         """Test that exit code is 1 for all error cases."""
-        mocker.patch("claude_telemetry.cli.console")
+        mocker.patch("claude_telemetry.cli._get_console")
 
-        with pytest.raises(typer.Exit) as exc_info:
+        with pytest.raises(SystemExit) as exc_info:
             handle_agent_error(RuntimeError("Test"))
-        assert exc_info.value.exit_code == 1
+        assert exc_info.value.code == 1
 
-        with pytest.raises(typer.Exit) as exc_info:
+        with pytest.raises(SystemExit) as exc_info:
             handle_agent_error(Exception("Test"))
-        assert exc_info.value.exit_code == 1
+        assert exc_info.value.code == 1
 
 
 class TestShowStartupBanner:
     """Tests for show_startup_banner function."""
 
+    @pytest.fixture(autouse=True)
+    def clear_backend_cache(self):
+        """Backend detection is cached per process; reset it around each test."""
+        _telemetry_backend.cache_clear()
+        yield
+        _telemetry_backend.cache_clear()
+
     def test_displays_model_info(self, mocker):
         """Test that model information is displayed."""
-        mock_console = mocker.patch("claude_telemetry.cli.console")
+        mock_console = mocker.patch("claude_telemetry.cli._get_console").return_value
 
         show_startup_banner(extra_args={"model": "opus"})
 
@@ -80,9 +90,9 @@ class TestShowStartupBanner:
 
     def test_displays_default_model_when_none(self, mocker):
         """Test that default is shown when model is None."""
-        mock_console = mocker.patch("claude_telemetry.cli.console")
-        mocker.patch("claude_telemetry.cli.Table")
-        mocker.patch("claude_telemetry.cli.Panel")
+        mock_console = mocker.patch("claude_telemetry.cli._get_console").return_value
+        mocker.patch("rich.table.Table")
+        mocker.patch("rich.panel.Panel")
 
         show_startup_banner(extra_args={})
 
@@ -91,9 +101,9 @@ class TestShowStartupBanner:
 
     def test_displays_tools_list(self, mocker):
         """Test that tools list is displayed."""
-        mock_console = mocker.patch("claude_telemetry.cli.console")
-        mock_table = mocker.patch("claude_telemetry.cli.Table")
-        mocker.patch("claude_telemetry.cli.Panel")
+        mock_console = mocker.patch("claude_telemetry.cli._get_console").return_value
+        mock_table = mocker.patch("rich.table.Table")
+        mocker.patch("rich.panel.Panel")
 
         show_startup_banner(extra_args={"allowed-tools": "Read,Write,Bash"})
 
@@ -102,11 +112,11 @@ class TestShowStartupBanner:
 
     def test_displays_all_tools_when_none_specified(self, mocker):
         """Test that 'All available' is shown when tools is None."""
-        mocker.patch("claude_telemetry.cli.console")
-        mock_table_class = mocker.patch("claude_telemetry.cli.Table")
+        mocker.patch("claude_telemetry.cli._get_console")
+        mock_table_class = mocker.patch("rich.table.Table")
         mock_table = mocker.MagicMock()
         mock_table_class.return_value = mock_table
-        mocker.patch("claude_telemetry.cli.Panel")
+        mocker.patch("rich.panel.Panel")
 
         show_startup_banner(extra_args={})
 
@@ -118,11 +128,11 @@ class TestShowStartupBanner:
         """Test that Logfire backend is shown when token is set."""
         monkeypatch.setenv("LOGFIRE_TOKEN", "test_token")
 
-        mocker.patch("claude_telemetry.cli.console")
-        mock_table_class = mocker.patch("claude_telemetry.cli.Table")
+        mocker.patch("claude_telemetry.cli._get_console")
+        mock_table_class = mocker.patch("rich.table.Table")
         mock_table = mocker.MagicMock()
         mock_table_class.return_value = mock_table
-        mocker.patch("claude_telemetry.cli.Panel")
+        mocker.patch("rich.panel.Panel")
 
         show_startup_banner(extra_args={})
 
@@ -135,11 +145,11 @@ class TestShowStartupBanner:
         monkeypatch.delenv("LOGFIRE_TOKEN", raising=False)
         monkeypatch.setenv("OTEL_EXPORTER_OTLP_ENDPOINT", "https://api.honeycomb.io")
 
-        mocker.patch("claude_telemetry.cli.console")
-        mock_table_class = mocker.patch("claude_telemetry.cli.Table")
+        mocker.patch("claude_telemetry.cli._get_console")
+        mock_table_class = mocker.patch("rich.table.Table")
         mock_table = mocker.MagicMock()
         mock_table_class.return_value = mock_table
-        mocker.patch("claude_telemetry.cli.Panel")
+        mocker.patch("rich.panel.Panel")
 
         show_startup_banner(extra_args={})
 
@@ -152,11 +162,11 @@ class TestShowStartupBanner:
         monkeypatch.delenv("LOGFIRE_TOKEN", raising=False)
         monkeypatch.delenv("OTEL_EXPORTER_OTLP_ENDPOINT", raising=False)
 
-        mocker.patch("claude_telemetry.cli.console")
-        mock_table_class = mocker.patch("claude_telemetry.cli.Table")
+        mocker.patch("claude_telemetry.cli._get_console")
+        mock_table_class = mocker.patch("rich.table.Table")
         mock_table = mocker.MagicMock()
         mock_table_class.return_value = mock_table
-        mocker.patch("claude_telemetry.cli.Panel")
+        mocker.patch("rich.panel.Panel")
 
         show_startup_banner(extra_args={})
 
@@ -164,6 +174,14 @@ class TestShowStartupBanner:
         add_row_calls = [str(call) for call in mock_table.add_row.call_args_list]
         assert any("None" in call or "debug" in call for call in add_row_calls)
 
+    def test_backend_detection_is_cached(self, monkeypatch):
+        """Test that the backend is detected once per process."""
+        monkeypatch.setenv("LOGFIRE_TOKEN", "test_token")
+        assert _telemetry_backend() == "logfire"
+
+        monkeypatch.delenv("LOGFIRE_TOKEN")
+        assert _telemetry_backend() == "logfire"
+
 
 class TestCLIIntegration:
     """Integration tests for CLI behavior."""
@@ -1,40 +1,53 @@
-"""Tests for CLI argument parsing using Typer."""
+"""Tests for CLI argument parsing."""
 
-from typer.testing import CliRunner
+import os
 
-from claude_telemetry.cli import app, parse_claude_args
+import pytest
 
-runner = CliRunner()
+from claude_telemetry.cli import main, parse_args, parse_claude_args
 
 
 class TestCLI:
-    """Tests for CLI using Typer's test runner."""
+    """Tests for the CLI entry point."""
 
-    def test_help_flag(self):
+    def test_help_flag(self, capsys):
         """Test that --help shows help."""
-        result = runner.invoke(app, ["--help"])
-        assert result.exit_code == 0
-        assert "Claude agent with OpenTelemetry instrumentation" in result.stdout
-
-    def test_version_flag(self):
+        main(["--help"])
+        stdout = capsys.readouterr().out
+        assert "Claude agent with OpenTelemetry instrumentation" in stdout
+        # Piped output is plain text, without Rich markup
+        assert "[bold]" not in stdout
+
+    def test_help_uses_ansi_bold_on_tty(self, capsys, mocker, monkeypatch):
+        """Test that terminal help output gets ANSI bold headings."""
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        mocker.patch("sys.stdout.isatty", return_value=True)
+        main(["--help"])
+        assert "\x1b[1mOptions:\x1b[0m" in capsys.readouterr().out
+
+    def test_short_help_flag(self, capsys):
+        """Test that -h shows help."""
+        main(["-h"])
+        assert "Usage: claudia" in capsys.readouterr().out
+
+    def test_version_flag(self, capsys):
         """Test that --version shows version."""
-        result = runner.invoke(app, ["--version"])
-        assert result.exit_code == 0
-        assert "claudia version" in result.stdout
+        main(["--version"])
+        assert "claudia version" in capsys.readouterr().out
 
-    def test_config_flag(self):
+    def test_config_flag(self, mocker):
         """Test that --config shows config."""
-        result = runner.invoke(app, ["--config"])
-        assert result.exit_code == 0
+        mock_show_config = mocker.patch("claude_telemetry.cli.show_config")
+        main(["--config"])
         # Config output will vary based on environment
+        mock_show_config.assert_called_once()
 
     def test_pass_through_flags_with_equals(self, mocker):
         """Test that Claude CLI flags with = format pass through."""
         # Mock the runner function so we don't actually execute Claude
-        mock_run = mocker.patch("claude_telemetry.cli.run_agent_with_telemetry_sync")
+        mock_run = mocker.patch("claude_telemetry.sync.run_agent_with_telemetry_sync")
 
-        result = runner.invoke(
-            app,
+        main(
             [
                 "--claudia-debug",
                 "--model=opus",
@@ -43,7 +56,6 @@ class TestCLI:
             ],
         )
 
-        assert result.exit_code == 0
         # Verify we called the runner with correct parsed args
         mock_run.assert_called_once()
         call_args = mock_run.call_args
@@ -53,10 +65,9 @@ class TestCLI:
 
     def test_pass_through_flags_with_space(self, mocker):
         """Test that Claude CLI flags with space format pass through."""
-        mock_run = mocker.patch("claude_telemetry.cli.run_agent_with_telemetry_sync")
+        mock_run = mocker.patch("claude_telemetry.sync.run_agent_with_telemetry_sync")
 
-        result = runner.invoke(
-            app,
+        main(
             [
                 "--claudia-debug",
                 "--model",
@@ -67,7 +78,6 @@ class TestCLI:
             ],
         )
 
-        assert result.exit_code == 0
         mock_run.assert_called_once()
         call_args = mock_run.call_args
         assert call_args.kwargs["prompt"] == "test"
@@ -75,38 +85,86 @@ class TestCLI:
 
     def test_boolean_flags(self, mocker):
         """Test that boolean flags are handled correctly."""
-        mock_run = mocker.patch("claude_telemetry.cli.run_agent_with_telemetry_sync")
+        mock_run = mocker.patch("claude_telemetry.sync.run_agent_with_telemetry_sync")
 
-        result = runner.invoke(
-            app,
-            ["--claudia-debug", "--verbose", "test"],
-        )
+        main(["--claudia-debug", "--verbose", "test"])
 
-        assert result.exit_code == 0
         mock_run.assert_called_once()
         call_args = mock_run.call_args
         assert call_args.kwargs["extra_args"]["verbose"] is None
 
-    def test_short_flags(self):
+    def test_short_flags(self, capsys):
         """Test that short flags work."""
-        result = runner.invoke(
-            app,
-            ["-v"],  # -v is --version
-        )
-        assert result.exit_code == 0
-        assert "version" in result.stdout.lower()
+        main(["-v"])  # -v is --version
+        assert "version" in capsys.readouterr().out.lower()
 
     def test_no_prompt_interactive_mode(self, mocker):
         """Test that no prompt triggers interactive mode."""
+        mocker.patch("claude_telemetry.cli._get_console")
         mock_interactive = mocker.patch(
-            "claude_telemetry.cli.run_agent_interactive_sync"
+            "claude_telemetry.sync.run_agent_interactive_sync"
         )
 
-        result = runner.invoke(app, [], input="exit\n")
+        main([])
 
-        assert result.exit_code == 0
         mock_interactive.assert_called_once()
 
+    def test_sets_environment_from_options(self, mocker, monkeypatch):
+        """Test that telemetry options are exported as environment variables."""
+        mocker.patch("claude_telemetry.sync.run_agent_with_telemetry_sync")
+        # Register the variables so monkeypatch removes them after the test
+        for name in (
+            "LOGFIRE_TOKEN",
+            "OTEL_EXPORTER_OTLP_ENDPOINT",
+            "OTEL_EXPORTER_OTLP_HEADERS",
+        ):
+            monkeypatch.setenv(name, "")
+
+        main(
+            [
+                "--logfire-token",
+                "token_123",
+                "--otel-endpoint=https://api.honeycomb.io",
+                "--otel-headers=x-honeycomb-team=key",
+                "test",
+            ]
+        )
+
+        assert os.environ["LOGFIRE_TOKEN"] == "token_123"
+        assert os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] == "https://api.honeycomb.io"
+        assert os.environ["OTEL_EXPORTER_OTLP_HEADERS"] == "x-honeycomb-team=key"
+
+
+class TestParseArgs:
+    """Tests for parse_args function."""
+
+    def test_separates_claudia_options(self):
+        """Test that claudia options are split from pass-through args."""
+        options, args = parse_args(
+            ["--logfire-token", "abc", "--model=opus", "--claudia-debug", "hi"]
+        )
+        assert options == {"logfire_token": "abc", "claudia_debug": True}
+        assert args == ["--model=opus", "hi"]
+
+    def test_parses_equals_value(self):
+        """Test --option=value format for claudia options."""
+        options, args = parse_args(["--otel-headers=a=1,b=2"])
+        assert options == {"otel_headers": "a=1,b=2"}
+        assert args == []
+
+    def test_eager_options_skip_parsing(self):
+        """Test that help/version/config short-circuit argument parsing."""
+        options, args = parse_args(["--logfire-token", "--model=opus", "-v"])
+        assert options == {"version": True}
+        assert args == []
+
+    def test_missing_value_exits(self, capsys):
+        """Test that a value option without a value is a usage error."""
+        with pytest.raises(SystemExit) as exc_info:
+            parse_args(["--logfire-token"])
+        assert exc_info.value.code == 2
+        assert "--logfire-token" in capsys.readouterr().err
+
 
 class TestParseClaudeArgs:
     """Tests for parse_claude_args function."""
@@ -149,6 +207,30 @@ class TestParseClaudeArgs:
         assert prompt == "api"
         assert extra_args == {"model": "opus", "debug": None, "v": None}
 
+    def test_splits_equals_format_at_first_equals(self):
+        """Test that values may themselves contain '='."""
+        args = ["--append-system-prompt=a=b", "go"]
+        prompt, extra_args = parse_claude_args(args)
+        assert prompt == "go"
+        assert extra_args == {"append-system-prompt": "a=b"}
+
+    def test_flag_takes_at_most_one_value(self):
+        """Test that a second bare word after a flag isn't consumed as its value."""
+        args = ["--model", "opus", "extra", "go"]
+        prompt, extra_args = parse_claude_args(args)
+        assert prompt == "go"
+        assert extra_args == {"model": "opus", "extra": None}
+
+    def test_returns_fresh_dict_for_repeated_args(self):
+        """Test that mutating one result doesn't leak into later parses."""
+        args = ["--model", "opus", "go"]
+        _, first = parse_claude_args(args)
+        first["debug"] = None
+
+        _, second = parse_claude_args(args)
+
+        assert second == {"model": "opus"}
+
     def test_handles_empty_args(self):
         """Test handling empty args list."""
         args = []
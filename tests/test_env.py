@@ -0,0 +1,28 @@
+"""Tests for environment variable parsing helper."""
+
+from claude_telemetry.helpers.env import env_int
+
+
+class TestEnvInt:
+    """Tests for env_int()."""
+
+    def test_parses_value(self, monkeypatch):
+        """Test that a valid integer is returned."""
+        monkeypatch.setenv("CLAUDE_TELEMETRY_TEST_INT", "42")
+        assert env_int("CLAUDE_TELEMETRY_TEST_INT", 7) == 42
+
+    def test_unset_or_empty_uses_default(self, monkeypatch):
+        """Test that missing and empty values fall back silently."""
+        monkeypatch.delenv("CLAUDE_TELEMETRY_TEST_INT", raising=False)
+        assert env_int("CLAUDE_TELEMETRY_TEST_INT", 7) == 7
+
+        monkeypatch.setenv("CLAUDE_TELEMETRY_TEST_INT", "")
+        assert env_int("CLAUDE_TELEMETRY_TEST_INT", 7) == 7
+
+    def test_invalid_value_warns_and_uses_default(self, monkeypatch, mocker):
+        """Test that a typo logs a warning instead of raising."""
+        warning = mocker.patch("claude_telemetry.helpers.env.logger.warning")
+        monkeypatch.setenv("CLAUDE_TELEMETRY_TEST_INT", "abc")
+
+        assert env_int("CLAUDE_TELEMETRY_TEST_INT", 7) == 7
+        warning.assert_called_once()
@@ -1,15 +1,25 @@
 """Tests for telemetry hooks."""
 
+import inspect
+import json
 import time
 
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import TraceIdRatioBased
 import pytest
 
+from claude_telemetry.helpers.logger import configure_logger, logger
 from claude_telemetry.hooks import TelemetryHooks
+from tests.conftest import run_python
 
 
 @pytest.fixture
-def hooks():
-    """Create TelemetryHooks instance for testing."""
+def hooks(mocker):
+    """Create TelemetryHooks instance for testing with telemetry enabled."""
+    mocker.patch(
+        "opentelemetry.trace.get_tracer_provider", return_value=TracerProvider()
+    )
     return TelemetryHooks(tracer_name="test-tracer")
 
 
@@ -31,6 +41,132 @@ def mock_tracer(mocker, mock_span):
     return tracer
 
 
+class TestTelemetryHooks:
+    """Tests for TelemetryHooks construction."""
+
+    def test_import_does_not_load_otel_sdk(self):
+        """Test that importing hooks only needs the OpenTelemetry API."""
+        code = (
+            "import sys, claude_telemetry.hooks; "
+            "print('opentelemetry.sdk.trace' in sys.modules)"
+        )
+        assert run_python(code) == "False"
+
+    def test_invalid_env_settings_keep_defaults(self, monkeypatch):
+        """Test that a typo in a numeric setting doesn't break importing hooks."""
+        monkeypatch.setenv("CLAUDE_TELEMETRY_MAX_ATTR", "8k")
+        monkeypatch.setenv("CLAUDE_TELEMETRY_USAGE_UPDATE_INTERVAL", "four")
+        code = (
+            "from claude_telemetry.hooks import TelemetryHooks as T; "
+            "print(T.MAX_ATTR_LENGTH, T.USAGE_UPDATE_INTERVAL)"
+        )
+        assert run_python(code).split() == ["10000", "4"]
+
+    def test_exports(self):
+        """Test that the module exports a single TelemetryHooks definition."""
+        import claude_telemetry.hooks as hooks_module  # noqa: PLC0415
+
+        assert TelemetryHooks.__module__ == "claude_telemetry.hooks"
+        assert "TelemetryHooks" in hooks_module.__all__
+        source = inspect.getsource(hooks_module)
+        assert source.count("class TelemetryHooks") == 1
+
+    def test_uses_slots(self, hooks):
+        """Test that instances have a fixed attribute set."""
+        assert not hasattr(hooks, "__dict__")
+        with pytest.raises(AttributeError):
+            hooks.unknown_attribute = True
+
+
+class TestTelemetryDisabled:
+    """Tests for hooks when no tracer provider is configured."""
+
+    @pytest.fixture
+    def disabled_hooks(self):
+        """Create TelemetryHooks with the default proxy tracer provider."""
+        return TelemetryHooks(tracer_name="test-tracer")
+
+    @pytest.mark.asyncio
+    async def test_skips_span_work(self, disabled_hooks, mocker):
+        """Test that hooks track metrics without creating spans."""
+        disabled_hooks.tracer = mocker.MagicMock()
+        disabled_hooks.create_tool_spans = True
+
+        await disabled_hooks.on_user_prompt_submit(
+            {"prompt": "Hi", "session_id": "1"}, None, {}
+        )
+        tool_data = {"tool_name": "Read", "tool_input": {"path": "/a.py"}}
+        await disabled_hooks.on_pre_tool_use(tool_data, "tool-1", {})
+        await disabled_hooks.on_post_tool_use(
+            {"tool_name": "Read", "tool_response": "ok"}, "tool-1", {}
+        )
+
+        disabled_hooks.tracer.start_span.assert_not_called()
+        assert disabled_hooks.tool_spans == {}
+        assert disabled_hooks.tools_used == 1
+
+    @pytest.mark.asyncio
+    async def test_completes_session_without_flush(self, disabled_hooks, mocker):
+        """Test that completing a session doesn't flush a backend."""
+        flush = mocker.patch.object(TelemetryHooks, "_flush")
+
+        await disabled_hooks.on_user_prompt_submit(
+            {"prompt": "Hi", "session_id": "1"}, None, {}
+        )
+        disabled_hooks.complete_session()
+
+        flush.assert_not_called()
+        assert disabled_hooks.session_span is None
+
+
+class TestSampling:
+    """Tests for head-based session sampling."""
+
+    @pytest.mark.asyncio
+    async def test_unsampled_session_skips_spans(self, hooks, mocker):
+        """Test that a dropped session creates no session or tool spans."""
+        hooks._sampler = TraceIdRatioBased(0.0)
+        hooks.tracer = mocker.MagicMock()
+        hooks.create_tool_spans = True
+
+        await hooks.on_user_prompt_submit({"prompt": "Hi", "session_id": "1"}, None, {})
+        await hooks.on_pre_tool_use({"tool_name": "Read"}, "tool-1", {})
+        await hooks.on_post_tool_use({"tool_name": "Read"}, "tool-1", {})
+
+        hooks.tracer.start_span.assert_not_called()
+        assert hooks.session_span is trace.INVALID_SPAN
+        assert hooks.tools_used == 1
+
+    @pytest.mark.asyncio
+    async def test_sampled_session_creates_span(self, hooks, mocker):
+        """Test that a sampled session opens the session span."""
+        hooks._sampler = TraceIdRatioBased(1.0)
+        hooks.tracer = mocker.MagicMock()
+
+        await hooks.on_user_prompt_submit({"prompt": "Hi", "session_id": "1"}, None, {})
+
+        hooks.tracer.start_span.assert_called_once()
+
+    def test_sample_rate_from_env(self, monkeypatch, mocker):
+        """Test that CLAUDE_TELEMETRY_SAMPLE_RATE configures a ratio sampler."""
+        monkeypatch.setenv("CLAUDE_TELEMETRY_SAMPLE_RATE", "0.25")
+
+        hooks = TelemetryHooks(tracer_name="test-tracer")
+
+        assert hooks._sampler.rate == 0.25
+
+    @pytest.mark.parametrize("rate", ["abc", "50", "-0.5"])
+    def test_invalid_sample_rate_traces_everything(self, monkeypatch, mocker, rate):
+        """Test that a bad sample rate warns and falls back to always-on."""
+        warning = mocker.patch("claude_telemetry.hooks.logger.warning")
+        monkeypatch.setenv("CLAUDE_TELEMETRY_SAMPLE_RATE", rate)
+
+        hooks = TelemetryHooks(tracer_name="test-tracer")
+
+        assert hooks._sampler is None
+        warning.assert_called_once()
+
+
 class TestUserPromptSubmit:
     """Tests for on_user_prompt_submit hook."""
 
@@ -53,7 +189,9 @@ class TestUserPromptSubmit:
 
         # Verify span attributes
         call_args = mock_tracer.start_span.call_args
-        assert "Analyze my code" in call_args[0][0]  # Span title contains prompt
+        assert call_args[0][0] == "agent_session"
+        assert call_args[1]["attributes"]["display_name"] == "Analyze my code"
+        assert call_args[1]["attributes"]["logfire.msg"] == "Analyze my code"
         assert call_args[1]["attributes"]["prompt"] == "Analyze my code"
         assert call_args[1]["attributes"]["model"] == "claude-3-5-sonnet-20241022"
 
@@ -67,17 +205,17 @@ class TestUserPromptSubmit:
 
         await hooks.on_user_prompt_submit(input_data, None, ctx)
 
-        assert hooks.metrics["prompt"] == "Test prompt"
-        assert hooks.metrics["model"] == "opus"
-        assert hooks.metrics["input_tokens"] == 0
-        assert hooks.metrics["output_tokens"] == 0
-        assert hooks.metrics["tools_used"] == 0
-        assert hooks.metrics["turns"] == 0
-        assert "start_time" in hooks.metrics
+        assert hooks.prompt == "Test prompt"
+        assert hooks.model == "opus"
+        assert hooks.input_tokens == 0
+        assert hooks.output_tokens == 0
+        assert hooks.tools_used == 0
+        assert hooks.turns == 0
+        assert hooks.start_ns > 0
 
     @pytest.mark.asyncio
     async def test_truncates_long_prompts_in_title(self, hooks, mocker, mock_tracer):
-        """Test that long prompts are truncated in span title."""
+        """Test that long prompts are truncated in the span display name."""
         hooks.tracer = mock_tracer
 
         long_prompt = "A" * 100
@@ -87,25 +225,11 @@ class TestUserPromptSubmit:
         await hooks.on_user_prompt_submit(input_data, None, ctx)
 
         call_args = mock_tracer.start_span.call_args
-        span_title = call_args[0][0]
+        span_title = call_args[1]["attributes"]["display_name"]
         # Should be truncated to 60 chars + "..."
         assert len(span_title) < len(long_prompt) + 10
         assert "..." in span_title
 
-    @pytest.mark.asyncio
-    async def test_stores_message_history(self, hooks, mocker, mock_tracer):
-        """Test that user message is stored in history."""
-        hooks.tracer = mock_tracer
-
-        input_data = {"prompt": "Test prompt", "session_id": "test-session"}
-        ctx = {"options": {"model": "claude-3-5-sonnet-20241022"}}
-
-        await hooks.on_user_prompt_submit(input_data, None, ctx)
-
-        assert len(hooks.messages) == 1
-        assert hooks.messages[0]["role"] == "user"
-        assert hooks.messages[0]["content"] == "Test prompt"
-
 
 class TestPreToolUse:
     """Tests for on_pre_tool_use hook."""
@@ -128,9 +252,67 @@ class TestPreToolUse:
         # Verify child span was created
         mock_tracer.start_span.assert_called_once()
         call_args = mock_tracer.start_span.call_args
-        assert "Read" in call_args[0][0]
+        assert call_args[0][0] == "tool_call"
+        assert "Read" in call_args[1]["attributes"]["display_name"]
+        assert (
+            call_args[1]["attributes"]["logfire.msg"]
+            == call_args[1]["attributes"]["display_name"]
+        )
         assert "tool-123" in hooks.tool_spans
 
+    @pytest.mark.asyncio
+    async def test_unserializable_tool_input_does_not_raise(
+        self, hooks, mocker, mock_tracer
+    ):
+        """Test that inputs JSON can't encode still get a tracked, recorded span."""
+        hooks.create_tool_spans = True
+        hooks.tracer = mock_tracer
+        hooks.session_span = mocker.MagicMock()
+        tool_input = {"n": 2**70, (1, 2): "tuple key"}
+
+        await hooks.on_pre_tool_use(
+            {"tool_name": "Calc", "tool_input": tool_input}, "tool-1", {}
+        )
+
+        assert hooks.tool_spans["tool-1"] is mock_tracer.start_span.return_value
+        event = mock_tracer.start_span.return_value.add_event.call_args
+        assert event[0][0] == "Tool input"
+        assert str(2**70) in event[0][1]["input"]
+
+    @pytest.mark.asyncio
+    async def test_records_tool_input_as_json(self, hooks, mocker, mock_tracer):
+        """Test that the tool input event carries the input serialized as JSON."""
+        hooks.create_tool_spans = True
+        hooks.session_span = mocker.MagicMock()
+        hooks.tracer = mock_tracer
+
+        input_data = {"tool_name": "Read", "tool_input": {"path": "/a.py"}}
+        await hooks.on_pre_tool_use(input_data, "tool-123", {})
+
+        tool_span = mock_tracer.start_span.return_value
+        name, event = tool_span.add_event.call_args[0]
+        assert name == "Tool input"
+        assert json.loads(event["input"]) == {"path": "/a.py"}
+
+    @pytest.mark.asyncio
+    async def test_records_event_without_tool_use_id(self, hooks, mocker):
+        """Test that tools without a tool_use_id are events, not child spans."""
+        hooks.create_tool_spans = True
+        hooks.session_span = mocker.MagicMock()
+        hooks.tracer = mocker.MagicMock()
+        mock_error = mocker.patch("claude_telemetry.hooks.logger.error")
+
+        input_data = {"tool_name": "Bash", "tool_input": {"command": "ls"}}
+        await hooks.on_pre_tool_use(input_data, None, {})
+        await hooks.on_post_tool_use(
+            {"tool_name": "Bash", "tool_response": "ok"}, None, {}
+        )
+
+        hooks.tracer.start_span.assert_not_called()
+        assert hooks.tool_spans == {}
+        assert hooks.session_span.add_event.call_count == 2
+        mock_error.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_adds_event_when_spans_disabled(self, hooks, mocker):
         """Test that event is added when create_tool_spans=False."""
@@ -163,8 +345,7 @@ class TestPreToolUse:
 
         await hooks.on_pre_tool_use(input_data, None, {})
 
-        assert hooks.metrics["tools_used"] == 1
-        assert "Bash" in hooks.tools_used
+        assert hooks.tools_used == 1
 
     @pytest.mark.asyncio
     async def test_raises_error_without_session_span(self, hooks):
@@ -176,10 +357,51 @@ class TestPreToolUse:
         with pytest.raises(RuntimeError, match="No active session span"):
             await hooks.on_pre_tool_use(input_data, None, {})
 
+    @pytest.mark.asyncio
+    async def test_skips_console_formatting_when_info_disabled(self, hooks, mocker):
+        """Test that tool input isn't formatted when no sink logs INFO."""
+        hooks.session_span = mocker.MagicMock()
+        format_input = mocker.patch(
+            "claude_telemetry.hooks._format_tool_input_for_console"
+        )
+        logger.remove()
+        logger.add(lambda _: None, level="WARNING")
+        try:
+            input_data = {"tool_name": "Read", "tool_input": {"path": "/a.py"}}
+            await hooks.on_pre_tool_use(input_data, "tool-123", {})
+        finally:
+            configure_logger()
+
+        format_input.assert_not_called()
+
 
 class TestPostToolUse:
     """Tests for on_post_tool_use hook."""
 
+    @pytest.mark.asyncio
+    async def test_skips_span_work_for_non_recording_session(self, hooks, mocker):
+        """Test that a non-recording session span short-circuits span work."""
+        hooks.create_tool_spans = True
+        hooks.session_span = trace.INVALID_SPAN
+        span = mocker.MagicMock()
+        hooks.tool_spans["tool-1"] = span
+
+        result = await hooks.on_post_tool_use(
+            {"tool_name": "Read", "tool_response": "ok"}, "tool-1", {}
+        )
+
+        assert result == {}
+        span.end.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_without_session_span_only_logs(self, hooks):
+        """Test that a post-tool hook outside a session doesn't fail."""
+        hooks.session_span = None
+
+        result = await hooks.on_post_tool_use({"tool_name": "Read"}, None, {})
+
+        assert result == {}
+
     @pytest.mark.asyncio
     async def test_adds_response_to_event_when_spans_disabled(self, hooks, mocker):
         """Test response is added as event when create_tool_spans=False."""
@@ -237,6 +459,119 @@ class TestPostToolUse:
         # Verify span was removed from tracking
         assert "tool-123" not in hooks.tool_spans
 
+    @pytest.mark.asyncio
+    async def test_truncates_long_string_response_attribute(
+        self, hooks, mocker, mock_span
+    ):
+        """Test that string responses are capped before becoming an attribute."""
+        hooks.create_tool_spans = True
+        hooks.session_span = mocker.MagicMock()
+        hooks.tool_spans["tool-123"] = mock_span
+
+        input_data = {"tool_name": "Bash", "tool_response": "x" * 20000}
+        await hooks.on_post_tool_use(input_data, "tool-123", {})
+
+        attributes = dict(call[0] for call in mock_span.set_attribute.call_args_list)
+        assert len(attributes["tool.response"]) == 10000
+        event = mock_span.add_event.call_args[0][1]
+        assert len(event["response"]) == 10000
+
+    @pytest.mark.asyncio
+    async def test_truncates_long_dict_fields(self, hooks, mocker, mock_span):
+        """Test that oversized dict fields are truncated rather than dropped."""
+        hooks.create_tool_spans = True
+        hooks.session_span = mocker.MagicMock()
+        hooks.tool_spans["tool-123"] = mock_span
+
+        response = {"stdout": "x" * 12000, "stderr": ""}
+        input_data = {"tool_name": "Bash", "tool_response": response}
+        await hooks.on_post_tool_use(input_data, "tool-123", {})
+
+        attributes = dict(call[0] for call in mock_span.set_attribute.call_args_list)
+        assert attributes["tool.response.stdout"] == "x" * 10000
+        assert attributes["tool.response.stderr"] == ""
+
+    @pytest.mark.asyncio
+    async def test_records_only_status_when_capture_disabled(
+        self, hooks, mocker, mock_span
+    ):
+        """Test that response content isn't recorded when capture is off."""
+        mocker.patch.object(TelemetryHooks, "CAPTURE_RESPONSES", False)
+        hooks.create_tool_spans = True
+        hooks.session_span = mocker.MagicMock()
+        hooks.tool_spans["tool-123"] = mock_span
+
+        input_data = {"tool_name": "Read", "tool_response": {"content": "secret"}}
+        await hooks.on_post_tool_use(input_data, "tool-123", {})
+
+        mock_span.set_attribute.assert_called_once_with("tool.status", "success")
+        mock_span.add_event.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_error_text_omitted_when_capture_disabled(
+        self, hooks, mocker, mock_span
+    ):
+        """Test that child spans record only error status when capture is off."""
+        mocker.patch.object(TelemetryHooks, "CAPTURE_RESPONSES", False)
+        hooks.create_tool_spans = True
+        hooks.session_span = mocker.MagicMock()
+        hooks.tool_spans["tool-123"] = mock_span
+
+        input_data = {"tool_name": "Bash", "tool_response": {"error": "x" * 35000}}
+        await hooks.on_post_tool_use(input_data, "tool-123", {})
+
+        mock_span.set_attribute.assert_called_once_with("tool.status", "error")
+        mock_span.add_event.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_truncates_error_attribute(self, hooks, mocker, mock_span):
+        """Test that captured error text is capped like other response data."""
+        hooks.create_tool_spans = True
+        hooks.session_span = mocker.MagicMock()
+        hooks.tool_spans["tool-123"] = mock_span
+
+        input_data = {"tool_name": "Bash", "tool_response": {"error": "x" * 35000}}
+        await hooks.on_post_tool_use(input_data, "tool-123", {})
+
+        attributes = dict(call[0] for call in mock_span.set_attribute.call_args_list)
+        assert len(attributes["tool.error"]) == 10000
+        assert attributes["tool.status"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_event_mode_records_only_status_when_capture_disabled(
+        self, hooks, mocker
+    ):
+        """Test that session events omit response content when capture is off."""
+        mocker.patch.object(TelemetryHooks, "CAPTURE_RESPONSES", False)
+        hooks.session_span = mocker.MagicMock()
+
+        input_data = {"tool_name": "Bash", "tool_response": {"error": "boom"}}
+        await hooks.on_post_tool_use(input_data, None, {})
+
+        event_data = hooks.session_span.add_event.call_args[0][1]
+        assert event_data == {"tool_name": "Bash", "status": "error"}
+
+    @pytest.mark.asyncio
+    async def test_skips_response_work_for_non_recording_span(
+        self, hooks, mocker, mock_span
+    ):
+        """Test that sampled-out spans are closed without recording data."""
+        hooks.create_tool_spans = True
+        hooks.session_span = mocker.MagicMock()
+        mock_span.is_recording.return_value = False
+        hooks.tool_spans["tool-123"] = mock_span
+
+        input_data = {
+            "tool_name": "Read",
+            "tool_response": {"content": "Test content"},
+        }
+
+        await hooks.on_post_tool_use(input_data, "tool-123", {})
+
+        mock_span.set_attribute.assert_not_called()
+        mock_span.add_event.assert_not_called()
+        mock_span.end.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_handles_missing_span_gracefully(self, hooks, mocker):
         """Test that missing span is handled without crashing."""
@@ -257,11 +592,9 @@ class TestMessageComplete:
     async def test_updates_token_counts(self, hooks, mocker):
         """Test that token counts are updated correctly."""
         hooks.session_span = mocker.MagicMock()
-        hooks.metrics = {
-            "input_tokens": 100,
-            "output_tokens": 200,
-            "turns": 2,
-        }
+        hooks.input_tokens = 100
+        hooks.output_tokens = 200
+        hooks.turns = 2
 
         # Mock message with usage
         message = mocker.MagicMock()
@@ -270,9 +603,33 @@ class TestMessageComplete:
 
         await hooks.on_message_complete(message, {})
 
-        assert hooks.metrics["input_tokens"] == 150
-        assert hooks.metrics["output_tokens"] == 350
-        assert hooks.metrics["turns"] == 3
+        assert hooks.input_tokens == 150
+        assert hooks.output_tokens == 350
+        assert hooks.turns == 3
+
+    @pytest.mark.asyncio
+    async def test_defaults_missing_token_counts(self, hooks, mocker):
+        """Test that usage objects missing a count default it to zero."""
+        hooks.session_span = mocker.MagicMock()
+        message = mocker.MagicMock()
+        message.usage = mocker.Mock(spec=["input_tokens"], input_tokens=40)
+
+        await hooks.on_message_complete(message, {})
+
+        assert hooks.input_tokens == 40
+        assert hooks.output_tokens == 0
+        assert hooks.turns == 1
+
+    @pytest.mark.asyncio
+    async def test_ignores_message_without_usage(self, hooks, mocker):
+        """Test that messages without usage don't count as turns."""
+        hooks.session_span = mocker.MagicMock()
+        message = mocker.Mock(spec=["content"], content="Hi")
+
+        await hooks.on_message_complete(message, {})
+
+        assert hooks.turns == 0
+        hooks.session_span.set_attributes.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_updates_span_attributes(self, hooks, mocker):
@@ -286,70 +643,108 @@ class TestMessageComplete:
 
         await hooks.on_message_complete(message, {})
 
-        # Verify span attributes were set
-        hooks.session_span.set_attribute.assert_any_call(
-            "gen_ai.usage.input_tokens", 100
-        )
-        hooks.session_span.set_attribute.assert_any_call(
-            "gen_ai.usage.output_tokens", 200
+        # Verify span attributes were set in one batch
+        hooks.session_span.set_attributes.assert_called_once_with(
+            {
+                "gen_ai.usage.input_tokens": 100,
+                "gen_ai.usage.output_tokens": 200,
+                "turns": 1,
+            }
         )
-        hooks.session_span.set_attribute.assert_any_call("turns", 1)
 
     @pytest.mark.asyncio
-    async def test_stores_assistant_message(self, hooks, mocker):
-        """Test that assistant message is stored in history."""
+    async def test_coalesces_span_attribute_updates(self, hooks, mocker):
+        """Test that usage attributes are written every few turns, not every turn."""
         hooks.session_span = mocker.MagicMock()
-        # No need to set metrics - __init__ handles it now
+        mocker.patch.object(TelemetryHooks, "USAGE_UPDATE_INTERVAL", 4)
+
+        message = mocker.MagicMock()
+        message.usage.input_tokens = 10
+        message.usage.output_tokens = 20
+        for _ in range(6):
+            await hooks.on_message_complete(message, {})
+
+        # Turns 1 and 5 update the span; every turn still gets its event
+        assert hooks.session_span.set_attributes.call_count == 2
+        assert hooks.session_span.add_event.call_count == 6
+        last_update = hooks.session_span.set_attributes.call_args[0][0]
+        assert last_update["turns"] == 5
+
+    @pytest.mark.asyncio
+    async def test_skips_attributes_for_non_recording_span(self, hooks, mocker):
+        """Test that non-recording spans don't get attribute updates."""
+        hooks.session_span = mocker.MagicMock()
+        hooks.session_span.is_recording.return_value = False
 
         message = mocker.MagicMock()
         message.usage.input_tokens = 100
         message.usage.output_tokens = 200
-        message.content = "Here's my response"
 
         await hooks.on_message_complete(message, {})
 
-        assert len(hooks.messages) == 1
-        assert hooks.messages[0]["role"] == "assistant"
-        assert hooks.messages[0]["content"] == "Here's my response"
+        hooks.session_span.set_attributes.assert_not_called()
+        assert hooks.input_tokens == 100
 
 
 class TestSessionCompletion:
     """Tests for session completion."""
 
-    def test_sets_final_attributes(self, hooks, mocker):
+    def test_flush_detects_backends_without_importing(self, mocker):
+        """Test that flushing falls back to the provider without importing SDKs."""
+        # A None entry makes any attempt to import the module raise ImportError
+        mocker.patch.dict("sys.modules", {"logfire": None, "sentry_sdk": None})
+        provider = mocker.MagicMock()
+        mocker.patch("opentelemetry.trace.get_tracer_provider", return_value=provider)
+
+        TelemetryHooks._flush()
+
+        provider.force_flush.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_sets_final_attributes(self, hooks, mocker):
         """Test that final attributes are set on span."""
         mock_span = mocker.MagicMock()
         hooks.session_span = mock_span
-        # Update existing metrics rather than replacing the whole dict
-        hooks.metrics["model"] = "claude-3-5-sonnet-20241022"
-        hooks.metrics["tools_used"] = 3
-        hooks.metrics["start_time"] = time.time()
-        hooks.tools_used = ["Read", "Write", "Bash"]
+        hooks.model = "claude-3-5-sonnet-20241022"
+        hooks.start_ns = time.monotonic_ns()
+        for tool_name in ["Read", "Write", "Bash", "Read"]:
+            await hooks.on_pre_tool_use({"tool_name": tool_name}, None, {})
 
         hooks.complete_session()
 
         # Check the captured mock span (hooks.session_span is now None)
-        mock_span.set_attribute.assert_any_call(
-            "gen_ai.request.model", "claude-3-5-sonnet-20241022"
-        )
-        mock_span.set_attribute.assert_any_call("tools_used", 3)
+        mock_span.set_attributes.assert_called_once()
+        attributes = mock_span.set_attributes.call_args[0][0]
+        assert attributes["gen_ai.request.model"] == "claude-3-5-sonnet-20241022"
+        assert attributes["tools_used"] == 4
+        assert attributes["gen_ai.usage.input_tokens"] == 0
+        assert attributes["turns"] == 0
         # Check tool_names was set with all three tools (order doesn't matter)
-        tool_names_calls = [
-            call
-            for call in mock_span.set_attribute.call_args_list
-            if call[0][0] == "tool_names"
-        ]
-        assert len(tool_names_calls) == 1
-        tool_names = set(tool_names_calls[0][0][1].split(","))
-        assert tool_names == {"Read", "Write", "Bash"}
+        tool_names = attributes["tool_names"].split(",")
+        assert sorted(tool_names) == ["Bash", "Read", "Write"]
+
+    @pytest.mark.asyncio
+    async def test_ends_unmatched_tool_spans(self, hooks, mocker):
+        """Test that tool spans without a post-tool hook end with the session."""
+        hooks.create_tool_spans = True
+        hooks.session_span = mocker.MagicMock()
+        tool_span = mocker.MagicMock()
+        hooks.tracer = mocker.MagicMock()
+        hooks.tracer.start_span.return_value = tool_span
+
+        pre_input = {"tool_name": "Bash", "tool_input": {"command": "ls"}}
+        await hooks.on_pre_tool_use(pre_input, "tool_123", {})
+        hooks.complete_session()
+
+        tool_span.end.assert_called_once()
+        assert hooks.tool_spans == {}
 
     def test_ends_span(self, hooks, mocker):
         """Test that span is ended."""
         mock_span = mocker.MagicMock()
         hooks.session_span = mock_span
-        # Update existing metrics rather than replacing
-        hooks.metrics["model"] = "test"
-        hooks.metrics["start_time"] = time.time()
+        hooks.model = "test"
+        hooks.start_ns = time.monotonic_ns()
 
         hooks.complete_session()
 
@@ -359,21 +754,17 @@ class TestSessionCompletion:
     def test_resets_state(self, hooks, mocker):
         """Test that internal state is reset after completion."""
         hooks.session_span = mocker.MagicMock()
-        # Update existing metrics
-        hooks.metrics["model"] = "test"
-        hooks.metrics["start_time"] = time.time()
-        hooks.metrics["tools_used"] = 1
-        hooks.messages = [{"role": "user", "content": "test"}]
-        hooks.tools_used = ["Read"]
+        hooks.model = "test"
+        hooks.start_ns = time.monotonic_ns()
+        hooks.tools_used = 1
         hooks.tool_spans = {"tool-1": mocker.MagicMock()}
 
         hooks.complete_session()
 
         assert hooks.session_span is None
         assert hooks.tool_spans == {}
-        assert hooks.metrics == {}
-        assert hooks.messages == []
-        assert hooks.tools_used == []
+        assert hooks.tools_used == 0
+        assert hooks.model == "unknown"
 
     def test_raises_error_without_session_span(self, hooks):
         """Test that error is raised if no session span exists."""
@@ -382,6 +773,43 @@ class TestSessionCompletion:
         with pytest.raises(RuntimeError, match="No active session span"):
             hooks.complete_session()
 
+    def test_flushes_inline_without_event_loop(self, hooks, mocker):
+        """Test that the flush runs inline when there's no running loop."""
+        flush = mocker.patch.object(TelemetryHooks, "_flush")
+        hooks.session_span = mocker.MagicMock()
+
+        assert hooks.complete_session() is None
+        flush.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_flushes_in_background_inside_event_loop(self, hooks, mocker):
+        """Test that the flush is handed to the executor after state is reset."""
+        states = []
+        mocker.patch.object(
+            TelemetryHooks,
+            "_flush",
+            side_effect=lambda: states.append(hooks.session_span),
+        )
+        hooks.session_span = mocker.MagicMock()
+
+        future = hooks.complete_session()
+        await future
+
+        assert states == [None]
+
+    @pytest.mark.asyncio
+    async def test_reuses_state_containers(self, hooks, mocker, mock_tracer):
+        """Test that session state is reset in place rather than reallocated."""
+        hooks.tracer = mock_tracer
+        tool_spans = hooks.tool_spans
+
+        await hooks.on_user_prompt_submit({"prompt": "Hi", "session_id": "1"}, None, {})
+        hooks.complete_session()
+        await hooks.on_user_prompt_submit({"prompt": "Hi", "session_id": "2"}, None, {})
+
+        assert hooks.tool_spans is tool_spans
+        assert hooks.turns == 0
+
 
 class TestContextCompaction:
     """Tests for context compaction hook."""
@@ -403,3 +831,15 @@ class TestContextCompaction:
         assert "Context compaction" in call_args[0][0]
         assert call_args[0][1]["trigger"] == "token_limit"
         assert call_args[0][1]["has_custom_instructions"] is True
+
+    @pytest.mark.asyncio
+    async def test_skips_event_without_recording_span(self, hooks, mocker):
+        """Test that no event data is built when the span isn't recording."""
+        input_data = mocker.MagicMock()
+        hooks.session_span = trace.INVALID_SPAN
+
+        await hooks.on_pre_compact(input_data, None, {})
+        hooks.session_span = None
+        await hooks.on_pre_compact(input_data, None, {})
+
+        input_data.get.assert_not_called()
@@ -1,5 +1,7 @@
 """Tests for Logfire adapter."""
 
+import os
+
 import pytest
 
 
@@ -30,6 +32,29 @@ class TestConfigureLogfire:
         )
         assert result == mock_provider
 
+    def test_sets_batch_processor_defaults(self, mocker, monkeypatch):
+        """Test that tuned OTEL_BSP_* defaults are set only while configuring."""
+        monkeypatch.setenv("LOGFIRE_TOKEN", "test_token")
+        monkeypatch.setenv("OTEL_BSP_MAX_QUEUE_SIZE", "100")
+        monkeypatch.delenv("OTEL_BSP_SCHEDULE_DELAY", raising=False)
+
+        seen = {}
+        mock_logfire = mocker.MagicMock()
+        mock_logfire.configure.side_effect = lambda **_: seen.update(os.environ)
+        mocker.patch.dict("sys.modules", {"logfire": mock_logfire})
+        mocker.patch("claude_telemetry.logfire_adapter.trace.get_tracer_provider")
+
+        from claude_telemetry.logfire_adapter import configure_logfire  # noqa: PLC0415
+
+        configure_logfire(schedule_delay_millis=500)
+
+        # Explicit environment settings are left alone
+        assert seen["OTEL_BSP_MAX_QUEUE_SIZE"] == "100"
+        assert seen["OTEL_BSP_SCHEDULE_DELAY"] == "500"
+        # Defaults don't outlive configure, so subprocesses don't inherit them
+        assert os.environ["OTEL_BSP_MAX_QUEUE_SIZE"] == "100"
+        assert "OTEL_BSP_SCHEDULE_DELAY" not in os.environ
+
     def test_raises_error_without_token(self, mocker, monkeypatch):
         """Test that error is raised when LOGFIRE_TOKEN is not set."""
         monkeypatch.delenv("LOGFIRE_TOKEN", raising=False)
@@ -0,0 +1,77 @@
+"""Tests for the package's lazy public API."""
+
+import pytest
+
+import claude_telemetry
+from tests.conftest import run_python
+
+
+class TestLazyExports:
+    """Tests for lazily resolved package attributes."""
+
+    def test_resolves_public_api(self):
+        """Test that public names resolve to the real implementations."""
+        from claude_telemetry.runner import run_agent_with_telemetry  # noqa: PLC0415
+        from claude_telemetry.telemetry import configure_telemetry  # noqa: PLC0415
+
+        assert claude_telemetry.run_agent_with_telemetry is run_agent_with_telemetry
+        assert claude_telemetry.configure_telemetry is configure_telemetry
+
+    def test_exposes_version(self):
+        """Test that __version__ is available."""
+        assert isinstance(claude_telemetry.__version__, str)
+        assert claude_telemetry.__version__
+
+    def test_unknown_attribute_raises(self):
+        """Test that unknown attributes raise AttributeError."""
+        with pytest.raises(AttributeError, match="no_such_thing"):
+            claude_telemetry.no_such_thing  # noqa: B018
+
+    def test_dir_lists_public_api(self):
+        """Test that dir() includes lazily loaded names."""
+        names = dir(claude_telemetry)
+        for name in claude_telemetry.__all__:
+            assert name in names
+
+    def test_dir_has_no_duplicates_after_access(self):
+        """Test that cached lazy names aren't listed twice."""
+        claude_telemetry.run_agent_with_telemetry  # noqa: B018
+
+        names = dir(claude_telemetry)
+
+        assert len(names) == len(set(names))
+
+    def test_cli_import_skips_version_lookup(self):
+        """Test that importing the CLI doesn't resolve the package version."""
+        code = (
+            "import sys, claude_telemetry.cli; "
+            "print('importlib.metadata' in sys.modules, "
+            "'__version__' in vars(claude_telemetry))"
+        )
+        assert run_python(code).split() == ["False", "False"]
+
+    def test_import_does_not_load_sdk(self):
+        """Test that importing the package doesn't import the heavy runtime."""
+        code = (
+            "import sys, claude_telemetry; "
+            "print('claude_agent_sdk' in sys.modules, "
+            "'claude_telemetry.runner' in sys.modules)"
+        )
+        assert run_python(code).split() == ["False", "False"]
+
+
+class TestEnvFile:
+    """Tests for loading .env on import."""
+
+    def _run(self, cwd, code):
+        return run_python(f"import sys, os, claude_telemetry; {code}", cwd=cwd)
+
+    def test_loads_env_file_from_cwd(self, tmp_path):
+        """Test that a .env in the working directory is loaded."""
+        (tmp_path / ".env").write_text("CLAUDE_TELEMETRY_TEST_VAR=from-dotenv\n")
+        code = "print(os.environ.get('CLAUDE_TELEMETRY_TEST_VAR'))"
+        assert self._run(tmp_path, code) == "from-dotenv"
+
+    def test_skips_dotenv_without_env_file(self, tmp_path):
+        """Test that dotenv isn't imported when there's no .env to load."""
+        assert self._run(tmp_path, "print('dotenv' in sys.modules)") == "False"
@@ -1,8 +1,20 @@
 """Tests for agent runner functions."""
 
+import io
+
 import pytest
+from rich.console import Console
 
-from claude_telemetry.runner import extract_message_text, run_agent_with_telemetry
+from claude_telemetry.runner import (
+    _build_hook_config,
+    _build_options,
+    _format_summary,
+    _log_claude_stderr,
+    extract_message_text,
+    run_agent_interactive,
+    run_agent_with_telemetry,
+)
+from tests.conftest import run_python
 
 
 async def _empty_async_generator():
@@ -11,6 +23,19 @@ async def _empty_async_generator():
     yield  # Make it a generator (unreachable)
 
 
+class TestRunnerImport:
+    """Tests for the runner module's import cost."""
+
+    def test_import_does_not_load_sdks(self):
+        """Test that importing the runner defers the Claude and OpenTelemetry SDKs."""
+        code = (
+            "import sys, claude_telemetry.runner; "
+            "print('claude_agent_sdk' in sys.modules, "
+            "'opentelemetry.sdk.trace' in sys.modules)"
+        )
+        assert run_python(code).split() == ["False", "False"]
+
+
 class TestExtractMessageText:
     """Tests for extract_message_text function."""
 
@@ -100,16 +125,67 @@ class TestExtractMessageText:
         assert result == "Part 0 Part 1 Part 2 Part 3 Part 4 "
 
 
+class TestBuildHookConfig:
+    """Tests for _build_hook_config function."""
+
+    def test_routes_each_event_to_hooks(self, mocker):
+        """Test that every hook event is wired to the matching hook method."""
+        hooks = mocker.MagicMock()
+
+        config = _build_hook_config(hooks)
+
+        assert {
+            event: [matcher.hooks for matcher in matchers]
+            for event, matchers in config.items()
+        } == {
+            "UserPromptSubmit": [[hooks.on_user_prompt_submit]],
+            "PreToolUse": [[hooks.on_pre_tool_use]],
+            "PostToolUse": [[hooks.on_post_tool_use]],
+            "MessageComplete": [[hooks.on_message_complete]],
+            "PreCompact": [[hooks.on_pre_compact]],
+        }
+
+
+class TestBuildOptions:
+    """Tests for _build_options function."""
+
+    def test_loads_all_setting_sources(self, mocker):
+        """Test that options request CLI-like settings without debug output."""
+        options = _build_options(mocker.MagicMock(), None, debug=False)
+
+        assert options.setting_sources == ["user", "project", "local"]
+        assert options.extra_args == {}
+        assert options.stderr is None
+
+    def test_debug_adds_flag_and_stderr_logging(self, mocker):
+        """Test that debug mode passes --debug and logs Claude CLI stderr."""
+        options = _build_options(mocker.MagicMock(), {"model": "opus"}, debug=True)
+
+        assert options.extra_args == {"model": "opus", "debug": None}
+        assert options.stderr is _log_claude_stderr
+
+
+class TestFormatSummary:
+    """Tests for _format_summary function."""
+
+    def test_shows_prompt_count(self):
+        """Test that the summary panel reports the number of prompts."""
+        panel = _format_summary(3)
+
+        assert panel.title == "📊 Metrics"
+        assert "Prompts: 3" in panel.renderable
+
+
 class TestRunAgentWithTelemetry:
     """Tests for run_agent_with_telemetry function."""
 
     @pytest.mark.asyncio
     async def test_configures_telemetry_before_running(self, mocker):
         """Test that telemetry is configured before agent runs."""
-        mock_configure = mocker.patch("claude_telemetry.runner.configure_telemetry")
+        mock_configure = mocker.patch("claude_telemetry.telemetry.configure_telemetry")
         mock_client = mocker.AsyncMock()
         mock_client_class = mocker.patch(
-            "claude_telemetry.runner.ClaudeSDKClient",
+            "claude_agent_sdk.ClaudeSDKClient",
             return_value=mock_client,
         )
         mock_client.__aenter__ = mocker.AsyncMock(return_value=mock_client)
@@ -127,10 +203,10 @@ class TestRunAgentWithTelemetry:
     @pytest.mark.asyncio
     async def test_sends_query_to_client(self, mocker):
         """Test that query is sent to Claude client."""
-        mocker.patch("claude_telemetry.runner.configure_telemetry")
+        mocker.patch("claude_telemetry.telemetry.configure_telemetry")
         mock_client = mocker.AsyncMock()
         mock_client_class = mocker.patch(
-            "claude_telemetry.runner.ClaudeSDKClient",
+            "claude_agent_sdk.ClaudeSDKClient",
             return_value=mock_client,
         )
         mock_client.__aenter__ = mocker.AsyncMock(return_value=mock_client)
@@ -148,17 +224,17 @@ class TestRunAgentWithTelemetry:
     @pytest.mark.asyncio
     async def test_completes_session_on_success(self, mocker):
         """Test that session is completed after successful execution."""
-        mocker.patch("claude_telemetry.runner.configure_telemetry")
+        mocker.patch("claude_telemetry.telemetry.configure_telemetry")
         mock_hooks = mocker.MagicMock()
         mock_hooks.session_span = mocker.MagicMock()
         mocker.patch(
-            "claude_telemetry.runner.TelemetryHooks",
+            "claude_telemetry.hooks.TelemetryHooks",
             return_value=mock_hooks,
         )
 
         mock_client = mocker.AsyncMock()
         mocker.patch(
-            "claude_telemetry.runner.ClaudeSDKClient",
+            "claude_agent_sdk.ClaudeSDKClient",
             return_value=mock_client,
         )
         mock_client.__aenter__ = mocker.AsyncMock(return_value=mock_client)
@@ -176,11 +252,11 @@ class TestRunAgentWithTelemetry:
     @pytest.mark.asyncio
     async def test_completes_session_on_error(self, mocker):
         """Test that session is completed even when error occurs."""
-        mocker.patch("claude_telemetry.runner.configure_telemetry")
+        mocker.patch("claude_telemetry.telemetry.configure_telemetry")
         mock_hooks = mocker.MagicMock()
         mock_hooks.session_span = mocker.MagicMock()
         mocker.patch(
-            "claude_telemetry.runner.TelemetryHooks",
+            "claude_telemetry.hooks.TelemetryHooks",
             return_value=mock_hooks,
         )
 
@@ -195,7 +271,7 @@ class TestRunAgentWithTelemetry:
         mock_client.query = mock_query_error
 
         mocker.patch(
-            "claude_telemetry.runner.ClaudeSDKClient",
+            "claude_agent_sdk.ClaudeSDKClient",
             return_value=mock_client,
         )
 
@@ -208,20 +284,20 @@ class TestRunAgentWithTelemetry:
     @pytest.mark.asyncio
     async def test_passes_model_to_options(self, mocker):
         """Test that model parameter is passed via extra_args."""
-        mocker.patch("claude_telemetry.runner.configure_telemetry")
+        mocker.patch("claude_telemetry.telemetry.configure_telemetry")
         mock_hooks = mocker.MagicMock()
         mock_hooks.session_span = mocker.MagicMock()
-        mocker.patch("claude_telemetry.runner.TelemetryHooks", return_value=mock_hooks)
+        mocker.patch("claude_telemetry.hooks.TelemetryHooks", return_value=mock_hooks)
 
         mock_options = mocker.MagicMock()
         mock_options_class = mocker.patch(
-            "claude_telemetry.runner.ClaudeAgentOptions",
+            "claude_agent_sdk.ClaudeAgentOptions",
             return_value=mock_options,
         )
 
         mock_client = mocker.AsyncMock()
         mocker.patch(
-            "claude_telemetry.runner.ClaudeSDKClient",
+            "claude_agent_sdk.ClaudeSDKClient",
             return_value=mock_client,
         )
         mock_client.__aenter__ = mocker.AsyncMock(return_value=mock_client)
@@ -241,16 +317,16 @@ class TestRunAgentWithTelemetry:
     @pytest.mark.asyncio
     async def test_passes_allowed_tools_to_options(self, mocker):
         """Test that allowed_tools parameter is passed via extra_args."""
-        mocker.patch("claude_telemetry.runner.configure_telemetry")
+        mocker.patch("claude_telemetry.telemetry.configure_telemetry")
         mock_hooks = mocker.MagicMock()
         mock_hooks.session_span = mocker.MagicMock()
-        mocker.patch("claude_telemetry.runner.TelemetryHooks", return_value=mock_hooks)
+        mocker.patch("claude_telemetry.hooks.TelemetryHooks", return_value=mock_hooks)
 
-        mock_options_class = mocker.patch("claude_telemetry.runner.ClaudeAgentOptions")
+        mock_options_class = mocker.patch("claude_agent_sdk.ClaudeAgentOptions")
 
         mock_client = mocker.AsyncMock()
         mocker.patch(
-            "claude_telemetry.runner.ClaudeSDKClient",
+            "claude_agent_sdk.ClaudeSDKClient",
             return_value=mock_client,
         )
         mock_client.__aenter__ = mocker.AsyncMock(return_value=mock_client)
@@ -268,3 +344,38 @@ class TestRunAgentWithTelemetry:
         # Verify extra_args was passed to options
         call_kwargs = mock_options_class.call_args[1]
         assert call_kwargs["extra_args"] == {"allowed-tools": "Read,Write,Bash"}
+
+
+class TestRunAgentInteractive:
+    """Tests for run_agent_interactive function."""
+
+    @pytest.mark.asyncio
+    async def test_prints_each_message_as_its_own_panel(self, mocker):
+        """Test that every response message is rendered once, in order."""
+        mocker.patch("claude_telemetry.telemetry.configure_telemetry")
+        output = io.StringIO()
+        mocker.patch(
+            "rich.console.Console",
+            return_value=Console(file=output, width=80, color_system=None),
+        )
+        mocker.patch("builtins.input", side_effect=["hello", "exit"])
+
+        async def _two_messages():
+            yield mocker.Mock(content="First reply")
+            yield mocker.Mock(content="Second reply")
+
+        mock_client = mocker.AsyncMock()
+        mocker.patch("claude_agent_sdk.ClaudeSDKClient", return_value=mock_client)
+        mock_client.__aenter__ = mocker.AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = mocker.AsyncMock()
+        mock_client.receive_response = mocker.MagicMock(return_value=_two_messages())
+
+        await run_agent_interactive()
+
+        rendered = output.getvalue()
+        mock_client.query.assert_awaited_once_with(prompt="hello")
+        assert rendered.count("Claude") == 2
+        assert rendered.count("First reply") == 1
+        assert rendered.count("Second reply") == 1
+        assert rendered.index("First reply") < rendered.index("Second reply")
+        assert "Prompts: 1" in rendered
@@ -0,0 +1,47 @@
+"""Tests for JSON serialization helper."""
+
+import json
+
+import pytest
+
+from claude_telemetry.helpers import serialization
+from claude_telemetry.helpers.serialization import dumps
+
+
+@pytest.fixture
+def stdlib_only(mocker):
+    """Force the standard library fallback."""
+    mocker.patch.object(serialization, "orjson", None)
+
+
+class TestDumps:
+    """Tests for dumps()."""
+
+    def test_round_trips_nested_values(self):
+        """Test that nested dicts and lists serialize to valid JSON."""
+        value = {"files": ["a.py", "b.py"], "count": 2, "ok": True}
+
+        assert json.loads(dumps(value)) == value
+
+    def test_indent(self):
+        """Test that indent pretty-prints with two spaces."""
+        assert dumps({"a": 1}, indent=True) == '{\n  "a": 1\n}'
+
+    def test_falls_back_to_str_for_unknown_types(self):
+        """Test that non-serializable values are converted with str()."""
+
+        class Custom:
+            def __str__(self):
+                return "custom"
+
+        assert json.loads(dumps({"value": Custom()})) == {"value": "custom"}
+
+    def test_serializes_integers_beyond_64_bits(self):
+        """Test that values orjson rejects fall back to the stdlib encoder."""
+        assert json.loads(dumps({"n": 2**70})) == {"n": 2**70}
+        assert json.loads(dumps({"n": 2**70}, indent=True)) == {"n": 2**70}
+
+    def test_stdlib_fallback(self, stdlib_only):
+        """Test serialization without orjson installed."""
+        assert dumps({"a": [1, 2]}) == '{"a": [1, 2]}'
+        assert dumps({"a": 1}, indent=True) == '{\n  "a": 1\n}'
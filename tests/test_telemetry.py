@@ -43,7 +43,7 @@ class TestEndToEndTelemetry:
         )
 
         mocker.patch(
-            "claude_telemetry.runner.ClaudeSDKClient",
+            "claude_agent_sdk.ClaudeSDKClient",
             return_value=mock_client,
         )
 
@@ -206,6 +206,57 @@ class TestOTELConfiguration:
         mock_resource.assert_called_once_with({"service.name": "my-service"})
 
 
+class TestBatchSpanProcessor:
+    """Tests for the shared batch span processor settings."""
+
+    def test_uses_batching_defaults(self, mocker, monkeypatch):
+        """Test that our batching defaults apply when OTEL_BSP_* is unset."""
+        from claude_telemetry.telemetry import _batch_span_processor  # noqa: PLC0415
+
+        for env_var in (
+            "OTEL_BSP_MAX_QUEUE_SIZE",
+            "OTEL_BSP_SCHEDULE_DELAY",
+            "OTEL_BSP_MAX_EXPORT_BATCH_SIZE",
+            "OTEL_BSP_EXPORT_TIMEOUT",
+        ):
+            monkeypatch.delenv(env_var, raising=False)
+        mock_processor = mocker.patch("claude_telemetry.telemetry.BatchSpanProcessor")
+
+        _batch_span_processor("exporter")
+
+        mock_processor.assert_called_once_with(
+            "exporter",
+            max_queue_size=4096,
+            schedule_delay_millis=1000,
+            max_export_batch_size=256,
+            export_timeout_millis=10000,
+        )
+
+    def test_environment_overrides_defaults(self, mocker, monkeypatch):
+        """Test that OTEL_BSP_* environment variables win over our defaults."""
+        from claude_telemetry.telemetry import _batch_span_processor  # noqa: PLC0415
+
+        monkeypatch.setenv("OTEL_BSP_SCHEDULE_DELAY", "5000")
+        mock_processor = mocker.patch("claude_telemetry.telemetry.BatchSpanProcessor")
+
+        _batch_span_processor("exporter")
+
+        assert mock_processor.call_args[1]["schedule_delay_millis"] == 5000
+
+    def test_invalid_environment_value_falls_back(self, mocker, monkeypatch):
+        """Test that a bad OTEL_BSP_* value keeps the default instead of failing."""
+        from claude_telemetry.telemetry import _batch_span_processor  # noqa: PLC0415
+
+        monkeypatch.setenv("OTEL_BSP_SCHEDULE_DELAY", "abc")
+        monkeypatch.setenv("OTEL_BSP_MAX_QUEUE_SIZE", "")
+        mock_processor = mocker.patch("claude_telemetry.telemetry.BatchSpanProcessor")
+
+        _batch_span_processor("exporter")
+
+        assert mock_processor.call_args[1]["schedule_delay_millis"] == 1000
+        assert mock_processor.call_args[1]["max_queue_size"] == 4096
+
+
 class TestConsoleExporter:
     """Tests for console exporter configuration."""
 